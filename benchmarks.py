@@ -0,0 +1,183 @@
+"""Microbenchmarks for question selection, answer checking and lexicon loading.
+
+Each run builds synthetic lexicons of the requested sizes (in entries),
+compiles them, and times:
+
+    lexicon_build      generating every entry from roots with the engine
+    lexicon_columnar   the same, into the columnar in-memory lexicon
+    lexicon_open       opening the compiled, memory-mapped lexicon
+    prepare_questions  flattening and shuffling every entry, as the terminal quiz once did
+    mixed_questions    the first 10 questions of a lazily shuffled mixed quiz
+    question_batch     the service picking 10 questions, as the web app and API ask for them
+    apply_progress     the service recording 10 answers graded in the browser
+    grade              grading a wrong answer with the matcher
+
+Results are written as JSON; pass --compare with an earlier file to print
+the speed-up or slow-down of every benchmark.
+
+    python benchmarks.py --sizes 10,10000,1000000 --out bench.json
+    python benchmarks.py --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import islice
+
+from turkish_quiz.compiled_lexicon import CompiledLexicon, compile_lexicon
+from turkish_quiz.event_log import EventLog
+from turkish_quiz.lexicon import build_columnar_lexicon, build_suffix_examples, load_roots
+from turkish_quiz.matcher import grade
+from turkish_quiz.mixed import MixedQuiz, new_seed
+from turkish_quiz.morphology import CATEGORIES, NOUN, RULES, VERB
+from turkish_quiz.progress_store import ProgressStore
+from turkish_quiz.service import QuizService
+
+CONSONANTS = "bcçdfgğhklmnprsştvyz"
+VOWELS = "aeıioöuü"
+BATCH = 10  # questions per request, as the web app prefetches them
+
+
+def synthetic_roots_file(n_entries, directory):
+    """Write a roots.tsv whose roots expand to about `n_entries` entries."""
+    nouns_per_root = sum(1 for rule in RULES.values() if rule.pos == NOUN)
+    n_roots = max(2, -(-n_entries // nouns_per_root))
+    path = os.path.join(directory, f"roots-{n_entries}.tsv")
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_roots):
+            # Spell i in base-160 CV syllables so every root is distinct
+            root, n = "", i
+            while True:
+                n, syllable = divmod(n, len(CONSONANTS) * len(VOWELS))
+                root += CONSONANTS[syllable // len(VOWELS)] + VOWELS[syllable % len(VOWELS)]
+                if not n:
+                    break
+            root += CONSONANTS[i % len(CONSONANTS)]
+            if i % 2:
+                f.write(f"{root}\t{VERB}\t{root}ar\n")
+            else:
+                f.write(f"{root}\t{NOUN}\tel {root}o\n")
+    return path
+
+
+def prepare_questions(examples_dict):
+    """The mixed-quiz list the terminal quiz built before it streamed from a MixedQuiz."""
+    all_questions = [
+        (category, root, form, explanation)
+        for category, items in examples_dict.items()
+        for root, form, explanation, _ in items
+    ]
+    random.shuffle(all_questions)
+    return all_questions
+
+
+def timeit(fn, min_time=0.2, max_repeats=100_000):
+    """Per-call times in seconds, repeating `fn` for at least `min_time`."""
+    times = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < max_repeats and (len(times) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_size(n_entries, directory):
+    roots_path = synthetic_roots_file(n_entries, directory)
+    lexicon_path = os.path.join(directory, f"lexicon-{n_entries}.bin")
+    roots = load_roots(roots_path)
+    examples = build_suffix_examples(roots)
+    compile_lexicon(examples, lexicon_path)
+    size = sum(len(items) for items in examples.values())
+
+    results = {
+        "lexicon_build": timeit(lambda: build_suffix_examples(roots), max_repeats=5),
+        "lexicon_columnar": timeit(lambda: build_columnar_lexicon(roots), max_repeats=5),
+        "lexicon_open": timeit(lambda: CompiledLexicon(lexicon_path).close()),
+    }
+    lexicon = CompiledLexicon(lexicon_path)
+    results["prepare_questions"] = timeit(lambda: prepare_questions(lexicon), max_repeats=5)
+    results["mixed_questions"] = timeit(lambda: list(islice(MixedQuiz(lexicon, new_seed()).stream(), 10)))
+
+    # A service of its own, so the event log and progress database stay in the temporary directory
+    service = QuizService(lexicon, events=EventLog(os.path.join(directory, f"events-{n_entries}")),
+                          progress=ProgressStore(os.path.join(directory, f"progress-{n_entries}.db")))
+    session = f"bench-{n_entries}"
+    category = CATEGORIES[0]
+
+    def question_batch():
+        # Hand the batch back, as a reload does, so the deck never runs dry
+        batch = service.question_batch(session, category, BATCH)
+        service.skip_many(session, [question[:2] for question in batch])
+
+    results["question_batch"] = timeit(question_batch)
+    progress = [[category, question[1], 1] for question in service.question_batch(session, category, BATCH)]
+    results["apply_progress"] = timeit(lambda: service.apply_progress(session, progress))
+    results["grade"] = timeit(lambda: grade("kitaplır", "kitaplar", "kitap"))
+    service.close()
+    lexicon.close()
+
+    rows = []
+    for name, times in results.items():
+        rows.append({
+            "benchmark": name,
+            "size": size,
+            "calls": len(times),
+            "mean_us": round(statistics.fmean(times) * 1e6, 3),
+            "median_us": round(statistics.median(times) * 1e6, 3),
+            "min_us": round(min(times) * 1e6, 3),
+        })
+    return rows
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return {(r["benchmark"], r["size"]): r for r in json.load(f)["results"]}
+
+
+def compare(rows, baseline, baseline_path):
+    print(f"\nvs {baseline_path} (median, >1 means faster now)")
+    for row in rows:
+        old = baseline.get((row["benchmark"], row["size"]))
+        if old and row["median_us"]:
+            print(f"  {row['benchmark']:<18}{row['size']:>9}  {old['median_us'] / row['median_us']:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,10000,1000000", help="comma-separated lexicon sizes in entries")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    # Read the baseline first: it may be the file this run overwrites
+    baseline = load_baseline(args.compare) if args.compare else None
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_entries in (int(s) for s in args.sizes.split(",")):
+            for row in bench_size(n_entries, directory):
+                rows.append(row)
+                print(f"{row['benchmark']:<18}{row['size']:>9} entries  "
+                      f"median {row['median_us']:>12.3f} µs  ({row['calls']} calls)")
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": rows,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+    if baseline is not None:
+        compare(rows, baseline, args.compare)
+
+
+if __name__ == "__main__":
+    main()
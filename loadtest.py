@@ -0,0 +1,250 @@
+"""Load test for the web quiz app (turkish_quiz.web).
+
+Starts the app on a free localhost port (no share link, no analytics) and
+drives simulated quiz-takers through the same server endpoints the browser
+uses: load, change_category and refill. Answers and New Question clicks are
+handled in the browser, so they only show up as the progress events and
+refills they cause. Reports throughput, p50/p95/p99 latency per endpoint and
+the server's resident memory over the run.
+
+    python loadtest.py --sessions 2000 --concurrency 200 --questions 20 --json load.json
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from gradio_client import Client
+
+from turkish_quiz.morphology import CATEGORIES
+
+REFILL_AT = 3  # keep in step with turkish_quiz/web.py
+NO_DRILL = ("Any", "Any", "Any")  # root ending, last vowel and suffix form filters, all off
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    env = dict(
+        os.environ,
+        GRADIO_SERVER_NAME="127.0.0.1",
+        GRADIO_SERVER_PORT=str(port),
+        GRADIO_SHARE="false",
+        GRADIO_ANALYTICS_ENABLED="False",
+        QUIZ_METRICS_PORT="0",  # a dev server may already hold the default port
+    )
+    # A file rather than a pipe, so a chatty server can never block on a full pipe
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen([sys.executable, "-m", "turkish_quiz.web"], env=env, stdout=log, stderr=subprocess.STDOUT,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    process.log = log
+    return process
+
+
+def wait_until_up(url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            process.log.seek(0)
+            raise RuntimeError(f"server exited early:\n{process.log.read().decode(errors='replace')}")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not come up on {url} within {timeout}s")
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def call(self, endpoint, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self.lock:
+                self.errors[endpoint] += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+        return result
+
+
+def sample_memory(pid, samples, stop, interval=0.5):
+    start = time.monotonic()
+    while not stop.wait(interval):
+        rss = rss_mb(pid)
+        if rss is not None:
+            samples.append((round(time.monotonic() - start, 1), round(rss, 1)))
+
+
+def run_session(url, recorder, questions, correct_rate, change_rate, seed, order):
+    rng = random.Random(seed)
+    client = recorder.call("connect", Client, url, verbose=False)
+    category = rng.choice(CATEGORIES)
+    out = recorder.call("load", client.predict, category, order, *NO_DRILL, "null", "[]", "[]",
+                      api_name="/load")
+    current, buffer, pending = json.loads(out[5]), json.loads(out[6]), []
+
+    for _ in range(questions):
+        # Submit: graded in the browser, queued as a progress event
+        if current:
+            pending.append([current[0], current[1], int(rng.random() < correct_rate)])
+            current[2] = 1
+
+        if rng.random() < change_rate:
+            category = rng.choice(CATEGORIES)
+            out = recorder.call("change_category", client.predict, category, order, *NO_DRILL,
+                                json.dumps(current), json.dumps(buffer), json.dumps(pending),
+                                api_name="/change_category")
+            current, buffer, pending = json.loads(out[5]), json.loads(out[6]), []
+            continue
+
+        # New Question: taken from the buffer, refilled when it runs low
+        question = buffer.pop(0) if buffer else None
+        if question is None:
+            out = recorder.call("reload", client.predict, category, order, *NO_DRILL,
+                                json.dumps(current), json.dumps(buffer), json.dumps(pending),
+                                api_name="/reload")
+            current, buffer, pending = json.loads(out[5]), json.loads(out[6]), []
+            continue
+        current = [question[0], question[1], 0]
+        if len(buffer) < REFILL_AT:
+            batch = json.loads(recorder.call("refill", client.predict, category, order, *NO_DRILL,
+                                             json.dumps(pending), api_name="/refill"))
+            buffer.extend(batch["questions"])
+            pending = pending[batch["consumed"]:]
+
+
+def percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(recorder, elapsed, memory):
+    endpoints = {}
+    total = 0
+    for endpoint, values in sorted(recorder.latencies.items()):
+        values.sort()
+        total += len(values)
+        endpoints[endpoint] = {
+            "requests": len(values),
+            "errors": recorder.errors[endpoint],
+            "throughput_rps": round(len(values) / elapsed, 1),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        }
+    for endpoint, count in recorder.errors.items():
+        endpoints.setdefault(endpoint, {"requests": 0, "errors": count})
+    rss = [mb for _, mb in memory]
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "endpoints": endpoints,
+        "memory_mb": {
+            "start": rss[0] if rss else None,
+            "peak": max(rss) if rss else None,
+            "end": rss[-1] if rss else None,
+            "samples": memory,
+        },
+    }
+
+
+def print_report(report):
+    print(f"{report['requests']} requests in {report['elapsed_s']}s "
+          f"({report['throughput_rps']} req/s)")
+    print(f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<16}{stats['requests']:>10}{stats['errors']:>8}"
+              f"{stats.get('throughput_rps', 0):>9}{stats.get('p50_ms', '-'):>9}"
+              f"{stats.get('p95_ms', '-'):>9}{stats.get('p99_ms', '-'):>9}")
+    memory = report["memory_mb"]
+    if memory["peak"] is not None:
+        print(f"server RSS: start {memory['start']} MB, peak {memory['peak']} MB, end {memory['end']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000, help="simulated quiz-takers in total")
+    parser.add_argument("--concurrency", type=int, default=100, help="sessions running at once")
+    parser.add_argument("--questions", type=int, default=20, help="questions answered per session")
+    parser.add_argument("--correct-rate", type=float, default=0.7)
+    parser.add_argument("--change-rate", type=float, default=0.05, help="chance of switching category per question")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--adaptive", action="store_true", help="use the Adaptive question order")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    server = start_server(port)
+    try:
+        wait_until_up(url, server)
+        recorder = Recorder()
+        memory, stop = [], threading.Event()
+        sampler = threading.Thread(target=sample_memory, args=(server.pid, memory, stop), daemon=True)
+        sampler.start()
+
+        start = time.perf_counter()
+        failures = 0
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [
+                pool.submit(run_session, url, recorder, args.questions, args.correct_rate,
+                            args.change_rate, args.seed * 1_000_003 + i,
+                            "Adaptive" if args.adaptive else "Spaced repetition")
+                for i in range(args.sessions)
+            ]
+            for future in futures:
+                if future.exception() is not None:
+                    failures += 1
+        elapsed = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    report = summarize(recorder, elapsed, memory)
+    report["failed_sessions"] = failures
+    print_report(report)
+    if failures:
+        print(f"{failures} of {args.sessions} sessions failed")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
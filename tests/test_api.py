@@ -0,0 +1,113 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from turkish_quiz.api import MAX_BODY, QuizAPI
+from turkish_quiz.event_log import EventLog
+from turkish_quiz.progress_store import ProgressStore
+from turkish_quiz.service import QuizService
+
+
+def make_service(tmp_path):
+    return QuizService(events=EventLog(str(tmp_path / "events")),
+                       progress=ProgressStore(str(tmp_path / "progress.db")))
+
+
+@pytest.fixture
+def api(tmp_path):
+    service = make_service(tmp_path)
+    yield QuizAPI(service)
+    service.close()
+
+
+def call(api, method, path, body=b"", headers=()):
+    """Run one request through the ASGI app; returns (status, decoded JSON)."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    asyncio.run(api(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def post(api, path, payload, headers=()):
+    return call(api, "POST", path, json.dumps(payload).encode(), headers)
+
+
+def test_questions(api):
+    status, response = post(api, "/v1/questions", {"session": "s", "category": "Plural", "count": 3})
+    assert status == 200
+    assert len(response["questions"]) == 3
+    assert {q["category"] for q in response["questions"]} == {"Plural"}
+
+
+def test_rejected_request_leaves_session_unchanged(api):
+    body = {"session": "s", "category": "Plural", "progress": [["Plural", 0, 1]], "drill": "bad"}
+    assert post(api, "/v1/questions", body)[0] == 400
+    body = {"session": "s", "category": "Plural", "progress": [["Plural", 0, 1]], "cursor": [1, 2]}
+    assert post(api, "/v1/questions", body)[0] == 400
+    assert call(api, "GET", "/v1/sessions/s/stats")[1]["total_attempts"] == 0
+
+
+@pytest.mark.parametrize("event", [["Plural", 10 ** 6, 1], ["Nope", 0, 1], ["Plural", 0, 2], ["Plural", "0", 1]])
+def test_invalid_progress(api, event):
+    body = {"session": "s", "category": "Plural", "progress": [event]}
+    assert post(api, "/v1/questions", body)[0] == 400
+
+
+def test_mixed_cursor_resumes_in_another_session(api):
+    first = post(api, "/v1/questions", {"session": "a", "category": "Mixed", "count": 2})[1]
+    later = post(api, "/v1/questions", {"session": "a", "category": "Mixed", "count": 3})[1]
+    resumed = post(api, "/v1/questions", {"session": "b", "category": "Mixed", "count": 3,
+                                          "cursor": first["cursor"]})[1]
+    assert resumed["questions"] == later["questions"]
+    assert resumed["cursor"] == later["cursor"]
+
+
+def test_gzip_body(api):
+    body = gzip.compress(json.dumps({"session": "s", "category": "Plural"}).encode())
+    status, response = call(api, "POST", "/v1/questions", body, [(b"content-encoding", b"gzip")])
+    assert status == 200 and len(response["questions"]) == 1
+
+
+def test_gzip_bomb_is_rejected(api):
+    body = gzip.compress(b" " * (MAX_BODY + 1))
+    assert len(body) < MAX_BODY
+    status, _ = call(api, "POST", "/v1/questions", body, [(b"content-encoding", b"gzip")])
+    assert status == 413
+
+
+def test_truncated_gzip(api):
+    body = gzip.compress(json.dumps({"category": "Plural"}).encode())[:-12]
+    assert call(api, "POST", "/v1/questions", body, [(b"content-encoding", b"gzip")])[0] == 400
+
+
+def test_learner_progress_outlives_the_service(tmp_path, api):
+    post(api, "/v1/learner", {"session": "s", "learner": "Ayşe"})
+    post(api, "/v1/questions", {"session": "s", "category": "Plural", "progress": [["Plural", 0, 1], ["Plural", 1, 0]]})
+    api.service.close()
+
+    restarted = QuizAPI(make_service(tmp_path))
+    status, stats = post(restarted, "/v1/learner", {"session": "new", "learner": " ayşe "})
+    assert status == 200
+    assert (stats["correct_count"], stats["total_attempts"]) == (1, 2)
+    restarted.service.close()
+
+
+def test_unexpected_errors_get_a_500(api, monkeypatch, caplog):
+    def broken(session_id):
+        raise RuntimeError("backend down")
+
+    monkeypatch.setattr(api.service, "stats", broken)
+    status, response = call(api, "GET", "/v1/sessions/s/stats")
+    assert status == 500
+    assert response == {"error": "internal server error"}
+    assert "backend down" in caplog.text
@@ -0,0 +1,12 @@
+from turkish_quiz.batch_grade import UNKNOWN, grade_rows
+from turkish_quiz.matcher import SOFTENING, TYPO
+
+KEY = {("kitap", "accusative"): ("kitabı", ""), ("kita", "accusative"): ("kitabı", "")}
+
+
+def test_answers_are_diagnosed_against_their_own_root():
+    rows = [("ali", "kitap", "Accusative", "kitapı"), ("ayşe", "kita", "Accusative", "kitapı"),
+            ("ali", "kalem", "Accusative", "kalemi")]
+    graded, tallies = grade_rows(rows, KEY)
+    assert [row[6] for row in graded] == [SOFTENING, TYPO, UNKNOWN]
+    assert tallies["ali"][:3] == [2, 0, 1]
@@ -0,0 +1,46 @@
+import errno
+import os
+
+import pytest
+
+from turkish_quiz import compiled_lexicon
+from turkish_quiz.columnar import ColumnarLexicon
+from turkish_quiz.compiled_lexicon import CompiledLexicon, compile_lexicon, open_lexicon
+
+EXAMPLES = {"Plural": [("kitap", "kitaplar", "-lar", "libro")]}
+
+
+def test_rebuilt_when_the_engine_changes(tmp_path):
+    path = str(tmp_path / "lexicon.bin")
+    compile_lexicon(EXAMPLES, path, fingerprint=b"old-rule")
+    lexicon = open_lexicon(path)
+    assert lexicon.fingerprint == compiled_lexicon.engine_fingerprint()
+    assert len(lexicon["Plural"]) > 1
+    lexicon.close()
+
+
+def test_falls_back_on_a_read_only_filesystem(tmp_path, monkeypatch):
+    def read_only(suffix_examples, path, fingerprint=None):
+        raise OSError(errno.EROFS, "Read-only file system", path)
+
+    monkeypatch.setattr(compiled_lexicon, "compile_lexicon", read_only)
+    monkeypatch.setattr(compiled_lexicon, "CACHE_DIR", str(tmp_path / "cache"))
+    lexicon = open_lexicon(str(tmp_path / "lexicon.bin"))
+    assert isinstance(lexicon, ColumnarLexicon)
+    assert len(lexicon["Plural"]) > 1
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    def disk_full(src, dst):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    path = str(tmp_path / "lexicon.bin")
+    monkeypatch.setattr(os, "replace", disk_full)
+    with pytest.raises(OSError):
+        compile_lexicon(EXAMPLES, path)
+    assert os.listdir(tmp_path) == []
+    monkeypatch.undo()
+    compile_lexicon(EXAMPLES, path)
+    lexicon = CompiledLexicon(path)
+    assert lexicon["Plural"][0] == EXAMPLES["Plural"][0]
+    lexicon.close()
@@ -0,0 +1,45 @@
+import os
+
+from turkish_quiz.event_log import EventLog, compact, read_columns
+
+
+def test_compaction_leaves_segments_other_writers_have_open(tmp_path):
+    directory = str(tmp_path)
+    # Two workers sharing one events directory; tiny segments so both rotate
+    first = EventLog(directory, max_bytes=200)
+    second = EventLog(directory, max_bytes=200)
+    first.writer.interval = second.writer.interval = 0.001
+    compacted = []
+    for i in range(40):
+        first.log("answer", item=i)
+        second.log("answer", item=1000 + i)
+        first.flush()
+        second.flush()
+        if i % 10 == 9:
+            path = compact(directory)
+            if path:
+                compacted.append(path)
+    # Each writer's current segment is still open and untouched
+    assert sum(name.endswith(".jsonl.open") for name in os.listdir(directory)) == 2
+
+    first.close()
+    second.close()
+    assert not any(name.endswith(".open") for name in os.listdir(directory))
+    compacted.append(compact(directory))
+
+    items = []
+    for path in compacted:
+        items += read_columns(path, {"item"})["item"]
+    assert sorted(items) == list(range(40)) + list(range(1000, 1040))
+
+
+def test_compact_all_takes_open_segments(tmp_path):
+    directory = str(tmp_path)
+    log = EventLog(directory)
+    log.log("question", item=1)
+    log.flush()
+    assert compact(directory) is None
+    path = compact(directory, include_open=True)
+    assert read_columns(path, {"item"})["item"] == [1]
+    log.close()
+    assert os.listdir(directory) == [os.path.basename(path)]
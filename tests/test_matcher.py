@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from turkish_quiz.matcher import (BUFFER, DIACRITICS, HARMONY, SOFTENING, TYPO, VOICING, WRONG,
+                                  bounded_distance, grade)
+
+
+def levenshtein(a, b):
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        row = [i]
+        for j, y in enumerate(b, 1):
+            row.append(min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (x != y)))
+        prev = row
+    return prev[-1]
+
+
+def test_bounded_distance_matches_levenshtein():
+    rng = random.Random(0)
+    for _ in range(2000):
+        a = "".join(rng.choice("abçı") for _ in range(rng.randrange(0, 12)))
+        b = "".join(rng.choice("abçı") for _ in range(rng.randrange(0, 12)))
+        k = rng.randrange(0, 8)
+        exact = levenshtein(a, b)
+        assert bounded_distance(a, b, k) == (exact if exact <= k else k + 1), (a, b, k)
+
+
+def test_bounded_distance_on_long_strings():
+    a = "kitap" * 30
+    assert bounded_distance(a, a[:-1] + "b", 2) == 1
+    assert bounded_distance(a, a[::-1], 3) == 4
+
+
+@pytest.mark.parametrize("answer, correct, root, error", [
+    ("kitaplır", "kitaplar", "kitap", HARMONY),
+    ("kitapı", "kitabı", "kitap", SOFTENING),
+    ("kitapda", "kitapta", "kitap", VOICING),
+    ("arabaı", "arabayı", "araba", BUFFER),
+    ("kopekler", "köpekler", "köpek", DIACRITICS),
+    ("kapiyi", "kapıyı", "kapı", DIACRITICS),
+    # Front/back vowel swaps that ASCII folding would hide
+    ("geldı", "geldi", "gel", HARMONY),
+    ("okulü", "okulu", "okul", HARMONY),
+    ("evlar", "evler", "ev", HARMONY),
+    ("gözlerü", "gözleri", "göz", HARMONY),
+    ("kitpalar", "kitaplar", "kitap", TYPO),
+    ("defterim", "kitaplar", "kitap", WRONG),
+])
+def test_diagnosis(answer, correct, root, error):
+    outcome = grade(answer, correct, root)
+    assert not outcome.correct
+    assert outcome.error == error
+
+
+def test_turkish_casefolding():
+    assert grade("IŞIKLAR", "ışıklar").correct
+    assert grade("İNEKLER", "inekler").correct
+    assert not grade("ISIKLAR", "ışıklar").correct
+
+
+def test_tolerant_and_typo_allowances():
+    assert grade("kopekler", "köpekler", tolerant=True).correct
+    assert grade("kitpalar", "kitaplar", max_typos=2).correct
+    # Grammar mistakes are never forgiven as typos
+    assert not grade("kitaplır", "kitaplar", "kitap", max_typos=2).correct
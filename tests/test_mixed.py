@@ -0,0 +1,66 @@
+import pytest
+
+from turkish_quiz.mixed import FeistelPermutation, MixedQuiz
+from turkish_quiz.session_state import QuizState
+
+LEXICON = {
+    "Plural": [("kitap", "kitaplar", "-lar", "libro"), ("ev", "evler", "-ler", "casa")],
+    "Locative": [("okul", "okulda", "-da", "escuela")],
+    "Empty": [],
+    "Ablative": [("ev", "evden", "-den", "casa"), ("kitap", "kitaptan", "-tan", "libro"),
+                 ("okul", "okuldan", "-dan", "escuela")],
+}
+
+
+@pytest.mark.parametrize("n", list(range(0, 70)) + [255, 256, 257, 1000, 4097])
+def test_permutation_is_a_bijection(n):
+    order = FeistelPermutation(n, seed=n)
+    assert sorted(order[i] for i in range(n)) == list(range(n))
+
+
+def test_permutation_depends_only_on_the_seed():
+    assert [FeistelPermutation(100, 7)[i] for i in range(100)] == [FeistelPermutation(100, 7)[i] for i in range(100)]
+    assert [FeistelPermutation(100, 7)[i] for i in range(100)] != [FeistelPermutation(100, 8)[i] for i in range(100)]
+
+
+def test_positions_out_of_range():
+    order = FeistelPermutation(5, 1)
+    with pytest.raises(IndexError):
+        order[5]
+    with pytest.raises(IndexError):
+        order[-1]
+
+
+def test_locate_maps_the_concatenation_onto_categories():
+    quiz = MixedQuiz(LEXICON, seed=1)
+    located = [quiz.locate(i) for i in range(len(quiz))]
+    assert located == [("Plural", 0), ("Plural", 1), ("Locative", 0),
+                       ("Ablative", 0), ("Ablative", 1), ("Ablative", 2)]
+
+
+def test_a_quiz_asks_every_entry_once():
+    quiz = MixedQuiz(LEXICON, seed=3)
+    asked = [(category, item) for category, item, example in quiz.stream()]
+    assert sorted(asked) == sorted((c, i) for c, items in LEXICON.items() for i in range(len(items)))
+    for category, item, example in quiz.stream():
+        assert example == LEXICON[category][item]
+
+
+def test_stream_resumes_from_a_position():
+    quiz = MixedQuiz(LEXICON, seed=5)
+    assert list(MixedQuiz(LEXICON, seed=5).stream(4)) == list(quiz.stream())[4:]
+
+
+def test_session_cursor_survives_a_snapshot_and_starts_over_when_done():
+    state = QuizState()
+    make_quiz = lambda seed: MixedQuiz(LEXICON, seed)
+    first = state.next_mixed(make_quiz, 2)
+    restored = QuizState()
+    restored.restore_session(state.session_snapshot())
+    assert restored.mixed == state.mixed
+    rest = restored.next_mixed(make_quiz, 10)
+    assert len(first) + len(rest) == 6
+    assert restored.mixed[1] == 6
+    # The next call starts a new pass in a new order
+    assert len(restored.next_mixed(make_quiz, 3)) == 3
+    assert restored.mixed[1] == 3
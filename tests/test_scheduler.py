@@ -0,0 +1,90 @@
+import json
+
+from turkish_quiz.scheduler import BOX_INTERVALS, Deck, LeitnerScheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_every_item_is_handed_out_once_before_any_repeats():
+    deck = Deck(50)
+    items = deck.take(30) + deck.take(30)
+    assert sorted(items) == list(range(50))
+    assert deck.take(1) == []
+
+
+def test_boxes_follow_answers():
+    deck = Deck(3)
+    item = deck.take(1)[0]
+    deck.record(item, True, 0.0)
+    assert deck.boxes[item] == 1
+    deck.record(item, True, 0.0)  # answered again without being handed out: still counts
+    assert deck.boxes[item] == 2
+    deck.record(item, False, 0.0)
+    assert deck.boxes[item] == 0
+    # The superseded heap entries are never handed out
+    assert sorted(deck.take(10)) == [0, 1, 2]
+
+
+def test_answers_outside_the_deck_reschedule_the_item():
+    clock = Clock()
+    scheduler = LeitnerScheduler(clock=clock)
+    # A drill answer before the deck was ever used is kept aside, without building the deck
+    scheduler.record(True, "Plural", 2, size=5)
+    assert scheduler.decks == {}
+    # Item 2 is due last, once, behind the items still due now
+    items = scheduler.next_items("Plural", 5, 10)
+    assert scheduler.decks["Plural"].boxes == {2: 1}
+    assert sorted(items) == [0, 1, 2, 3, 4]
+    assert items[-1] == 2
+
+
+def test_unknown_answers_are_ignored():
+    scheduler = LeitnerScheduler()
+    scheduler.record(True, "Plural", 0)
+    scheduler.record(True, "Plural", 99, size=5)
+    assert scheduler.decks == {} and scheduler.pending == {}
+
+
+def test_skipped_items_come_back_first_in_their_box():
+    clock = Clock()
+    scheduler = LeitnerScheduler(clock=clock)
+    items = scheduler.next_items("Plural", 4, 4)
+    scheduler.skip("Plural", items[0])
+    clock.now += BOX_INTERVALS[0]
+    assert scheduler.next_items("Plural", 4, 4) == [items[0]]
+
+
+def test_dump_and_load_round_trip_through_json():
+    clock = Clock()
+    scheduler = LeitnerScheduler(clock=clock)
+    taken = scheduler.next_items("Plural", 10, 4)
+    scheduler.record(True, "Plural", taken[0])
+    drilled = min(set(range(10)) - set(taken))
+    scheduler.record(False, "Plural", drilled, size=10)
+
+    restored = LeitnerScheduler(clock=clock)
+    restored.load(json.loads(json.dumps(scheduler.dump())))
+    assert restored.decks["Plural"].boxes == scheduler.decks["Plural"].boxes
+    assert restored.decks["Plural"].in_flight == set(taken[1:])
+    clock.now += max(BOX_INTERVALS)
+    assert restored.next_items("Plural", 10, 10) == scheduler.next_items("Plural", 10, 10)
+
+
+def test_saved_decks_grow_with_answers_not_with_the_deck():
+    clock = Clock()
+    scheduler = LeitnerScheduler(clock=clock)
+    taken = scheduler.next_items("Plural", 50_000, 5)
+    for item in taken[:3]:
+        scheduler.record(True, "Plural", item)
+    scheduler.record(False, "Plural", 49_999, size=50_000)
+    assert len(json.dumps(scheduler.dump())) < 1000
+
+    restored = LeitnerScheduler(clock=clock)
+    restored.load(json.loads(json.dumps(scheduler.dump())))
+    assert restored.next_items("Plural", 50_000, 20) == scheduler.next_items("Plural", 50_000, 20)
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from turkish_quiz.event_log import EventLog
+from turkish_quiz.progress_store import ProgressStore
+from turkish_quiz.service import QuizService
+
+BAD_EVENTS = [["Plural", 10 ** 6, 1], ["Nope", 0, 1], [["Plural"], 0, 1], ["Plural", "0", 1],
+              ["Plural", True, 1], ["Plural", 0, 2], ["Plural", 0], "Plural", None]
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = QuizService(events=EventLog(str(tmp_path / "events")),
+                          progress=ProgressStore(str(tmp_path / "progress.db")))
+    yield service
+    service.close()
+
+
+def test_strict_progress_rejects_the_whole_batch(service):
+    for bad in BAD_EVENTS:
+        with pytest.raises(ValueError):
+            service.apply_progress("s", [["Plural", 0, 1], bad])
+    assert service.stats("s")["total_attempts"] == 0
+
+
+def test_lenient_progress_drops_bad_events_and_consumes_them(service):
+    progress = [["Plural", 0, 1]] + BAD_EVENTS + [["Locative", 1, 0]]
+    assert service.apply_progress("s", progress, strict=False) == len(progress)
+    assert service.stats("s")["total_attempts"] == 2
+    assert service.apply_progress("s", "garbage", strict=False) == 0
+
+
+def test_skip_many_ignores_unknown_questions(service):
+    batch = service.question_batch("s", "Plural", 2)
+    service.skip_many("s", [q[:2] for q in batch] + [["Plural", -1], ["Nope", 0], [None], 7])
+    assert not service.sessions.get("s").scheduler.decks["Plural"].in_flight
+
+
+def test_mixed_answers_leave_the_session_small(tmp_path):
+    # Two large categories: answers to them must not build, or save, a deck over either
+    lexicon = {category: [(f"kök{i}", f"kök{i}ler", "-ler", "") for i in range(50_000)]
+               for category in ("Plural", "Locative")}
+    service = QuizService(lexicon=lexicon, events=EventLog(str(tmp_path / "events")),
+                          progress=ProgressStore(str(tmp_path / "progress.db")))
+    try:
+        for _ in range(3):
+            batch = service.question_batch("s", "Mixed", 10)
+            service.apply_progress("s", [[q[0], q[1], 1] for q in batch])
+        state = service.sessions.get("s")
+        assert state.total_attempts == 30
+        assert state.scheduler.decks == {} and state.bandit.decks == {}
+        assert len(json.dumps(state.session_snapshot())) < 10_000
+        # Starting a deck later picks up those answers
+        answered = {q[1] for q in batch if q[0] == "Plural"}
+        service.question_batch("s", "Plural", 1)
+        assert answered <= set(state.scheduler.decks["Plural"].boxes)
+    finally:
+        service.close()
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import pytest
+
+from turkish_quiz.session_state import QuizState, SessionStore
+from turkish_quiz.state_backend import (MemoryBackend, RedisBackend, RedisError, SQLiteBackend, _serve_client,
+                                        open_backend)
+
+
+@pytest.fixture
+def resp_server():
+    """The in-memory RESP stand-in on a free port, in a background thread."""
+    loop = asyncio.new_event_loop()
+    store = MemoryBackend()
+    server = loop.run_until_complete(
+        asyncio.start_server(lambda r, w: _serve_client(r, w, store), "127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server.sockets[0].getsockname()[1]
+
+    async def shutdown():
+        server.close()
+        for task in asyncio.all_tasks() - {asyncio.current_task()}:
+            task.cancel()
+        await server.wait_closed()
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(str(tmp_path / "state.db"))
+    else:
+        backend = RedisBackend(port=request.getfixturevalue("resp_server"), pool_size=2)
+    yield backend
+    backend.close()
+
+
+def test_get_set_delete(backend):
+    assert backend.get("missing") is None
+    value = b"\r\n$3\r\nbinary\x00\xff"
+    backend.set("key", value)
+    assert backend.get("key") == value
+    backend.set("key", b"new", ttl=60)
+    assert backend.get("key") == b"new"
+    assert backend.delete("key") == 1
+    assert backend.get("key") is None
+    assert backend.delete("key") == 0
+
+
+def test_expiry():
+    now = [0.0]
+    backend = MemoryBackend(clock=lambda: now[0])
+    backend.set("key", b"value", ttl=10)
+    now[0] = 9.9
+    assert backend.get("key") == b"value"
+    now[0] = 10
+    assert backend.get("key") is None
+
+
+def test_resp_connections_are_pooled_and_errors_raised(resp_server):
+    backend = RedisBackend(port=resp_server, pool_size=2)
+    threads = [threading.Thread(target=lambda i=i: [backend.set(f"k{i}", b"%d" % j) for j in range(50)])
+               for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [backend.get(f"k{i}") for i in range(4)] == [b"49"] * 4
+    with pytest.raises(RedisError):
+        backend.execute("NOSUCHCOMMAND")
+    assert backend.execute("PING") == "PONG"  # the pool is still usable after an error
+    backend.close()
+
+
+def test_two_processes_share_a_session(backend):
+    first, second = SessionStore(backend=backend), SessionStore(backend=backend)
+    state = first.get("s")
+    examples = [(f"root{i}", f"form{i}", "-lar", "") for i in range(20)]
+    items = state.next_examples("Plural", examples, 3)
+    state.record_answer(True, "Plural", items[0][0])
+    first.save("s", state)
+
+    other = second.get("s")
+    assert other is not state
+    assert other.correct_count == 1
+    assert other.scheduler.decks["Plural"].in_flight == {item for item, _ in items[1:]}
+    other.record_answer(False, "Plural", items[1][0])
+    second.save("s", other)
+    assert first.get("s").total_attempts == 2
+
+
+def test_open_backend_urls(tmp_path, monkeypatch):
+    monkeypatch.delenv("QUIZ_STATE_URL", raising=False)
+    assert open_backend() is None
+    assert isinstance(open_backend("memory:"), MemoryBackend)
+    backend = open_backend(f"sqlite:///{tmp_path}/state.db")
+    assert isinstance(backend, SQLiteBackend)
+    backend.close()
+    with pytest.raises(ValueError):
+        open_backend("mongodb://localhost")
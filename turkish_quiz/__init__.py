@@ -0,0 +1,8 @@
+"""Turkish suffix quiz: morphology engine, lexicon and quiz front ends.
+
+The terminal quiz lives in `turkish_quiz.cli`, the browser quiz in
+`turkish_quiz.web` and the JSON API in `turkish_quiz.api`; only the browser
+quiz imports gradio.
+"""
+
+__version__ = "0.1.0"
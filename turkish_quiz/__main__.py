@@ -0,0 +1,13 @@
+import sys
+
+
+def main():
+    # Import only the front end asked for, so the terminal quiz never loads gradio
+    if sys.argv[1:2] == ["web"]:
+        from .web import main as run
+    else:
+        from .cli import main as run
+    run()
+
+
+main()
@@ -0,0 +1,84 @@
+"""Live error rates by suffix type, rule and root for the teacher dashboard.
+
+Every graded answer bumps all-time counters, a constant-time dict update,
+and is written into a fixed-size ring of typed arrays (time, category, rule
+and root codes, wrong flag). A time-window report copies the ring under the
+lock and aggregates outside it, with numpy's bincount when numpy is
+installed, so a teacher's report never holds up grading for long.
+"""
+
+import threading
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WINDOW_CAPACITY = 200_000  # most recent answers kept for time-window reports
+DIMENSIONS = ("suffix_type", "rule", "root")
+
+
+class ErrorStats:
+    def __init__(self, capacity=WINDOW_CAPACITY, clock=time.time):
+        self.capacity = capacity
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.totals = {dimension: {} for dimension in DIMENSIONS}  # name → [attempts, wrong]
+        self.codes = {dimension: {} for dimension in DIMENSIONS}  # name → code in the ring
+        self.names = {dimension: [] for dimension in DIMENSIONS}
+        self.times = array("d", [0.0]) * capacity
+        self.columns = {dimension: array("I", [0]) * capacity for dimension in DIMENSIONS}
+        self.wrong = array("B", [0]) * capacity
+        self.recorded = 0
+
+    def record(self, suffix_type, rule, root, correct):
+        wrong = 0 if correct else 1
+        with self.lock:
+            slot = self.recorded % self.capacity
+            self.recorded += 1
+            self.times[slot] = self.clock()
+            self.wrong[slot] = wrong
+            for dimension, name in zip(DIMENSIONS, (suffix_type, rule, root)):
+                total = self.totals[dimension].get(name)
+                if total is None:
+                    total = self.totals[dimension][name] = [0, 0]
+                    self.codes[dimension][name] = len(self.names[dimension])
+                    self.names[dimension].append(name)
+                total[0] += 1
+                total[1] += wrong
+                self.columns[dimension][slot] = self.codes[dimension][name]
+
+    def report(self, dimension, seconds=None):
+        """[(name, attempts, wrong)] for `dimension`, over the last `seconds` or all time."""
+        if seconds is None:
+            with self.lock:
+                return [(name, attempts, wrong) for name, (attempts, wrong) in self.totals[dimension].items()]
+
+        with self.lock:
+            times = self.times[:]
+            codes = self.columns[dimension][:]
+            wrong = self.wrong[:]
+            names = self.names[dimension][:]
+        # Unused slots have time 0, so they always fall before the cutoff
+        cutoff = self.clock() - seconds
+        if np is not None:
+            recent = np.frombuffer(times, dtype=times.typecode) >= cutoff
+            recent_codes = np.frombuffer(codes, dtype=codes.typecode)[recent]
+            attempts = np.bincount(recent_codes, minlength=len(names))
+            misses = np.bincount(recent_codes, weights=np.frombuffer(wrong, dtype=wrong.typecode)[recent],
+                                 minlength=len(names))
+        else:
+            attempts, misses = [0] * len(names), [0] * len(names)
+            for t, code, w in zip(times, codes, wrong):
+                if t >= cutoff:
+                    attempts[code] += 1
+                    misses[code] += w
+        return [(names[i], int(attempts[i]), int(misses[i])) for i in range(len(names)) if attempts[i]]
+
+
+def error_table(rows, limit=None):
+    """Rows for a dashboard table, highest error rate first."""
+    rows = sorted(rows, key=lambda row: (-row[2] / row[1], -row[1]))
+    return [[name, attempts, wrong, f"{wrong / attempts:.0%}"] for name, attempts, wrong in rows[:limit]]
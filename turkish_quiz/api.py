@@ -0,0 +1,319 @@
+"""JSON HTTP API for the quiz, for mobile apps and LMS integrations.
+
+A bare ASGI application on the same QuizService as the web app, so it runs
+under any ASGI server; `turkish-quiz-api` starts it with uvicorn, which
+keeps HTTP/1.1 connections alive between requests. Responses are gzipped
+when the client accepts it and the body is large enough to benefit.
+
+    GET  /v1/categories
+    POST /v1/questions     {"session", "category", "count", "progress", "adaptive", "drill", "cursor"}
+    POST /v1/grade         {"session", "category", "item", "answer", "tolerant"}
+    POST /v1/grade/batch   {"session", "answers": [{"category", "item", "answer", "tolerant"}, ...]}
+    POST /v1/learner       {"session", "learner"}
+    GET  /v1/sessions/<session>/stats
+    GET  /metrics          Prometheus text format, for this worker process
+
+Questions carry no answers; clients send answers back to /v1/grade, or
+grade them locally and report [category, item, 1/0/null] events in
+`progress` with their next /v1/questions call. A request without a
+`session` starts a new one, whose id is returned in the response.
+/v1/learner ties the session to a named learner: it carries on with that
+learner's saved score, and its answers are saved for the next session.
+`"adaptive": true` picks questions by Thompson sampling instead of from
+the learner's Leitner deck. `"drill": {"final": "voiceless", "suffix": "-tan"}`
+only asks items with those features (see feature_index for the dimensions).
+The "Mixed" category asks every category in one shuffled order; its
+responses carry a `cursor` [seed, position], which a later request can send
+back to carry on the same quiz, in any session.
+
+`--workers N` runs N processes; they need a shared session backend in
+$QUIZ_STATE_URL (see state_backend) to serve the same learners.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+import zlib
+
+from . import metrics
+from .feature_index import DIMENSIONS
+from .mixed import MIXED_CATEGORY
+from .service import QuizService
+from .state_backend import STATE_URL_ENV
+
+MAX_BODY = 1024 * 1024
+MAX_QUESTIONS = 50
+MAX_BATCH = 200
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+KEEP_ALIVE = 30  # seconds an idle connection stays open
+# Routes that read SQLite, so they always run in a worker thread
+THREADED_ROUTES = {"/v1/learner"}
+
+log = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _session(body):
+    session = body.get("session")
+    if session is None:
+        return uuid.uuid4().hex
+    if not isinstance(session, str) or not session:
+        raise HTTPError(400, "session must be a non-empty string")
+    return session
+
+
+def _int(body, key, default=None, low=0, high=None):
+    value = body.get(key, default)
+    if not isinstance(value, int) or isinstance(value, bool) or value < low or (high is not None and value > high):
+        raise HTTPError(400, f"{key} must be an integer between {low} and {high}")
+    return value
+
+
+class QuizAPI:
+    def __init__(self, service=None):
+        self.service = QuizService() if service is None else service
+        self.routes = {
+            ("GET", "/v1/categories"): self.categories,
+            ("POST", "/v1/questions"): self.questions,
+            ("POST", "/v1/grade"): self.grade,
+            ("POST", "/v1/grade/batch"): self.grade_batch,
+            ("POST", "/v1/learner"): self.learner,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        if scope["path"] == "/metrics" and scope["method"] == "GET":
+            await self._respond_text(send, metrics.REGISTRY.exposition())
+            return
+
+        start = time.perf_counter()
+        headers = dict(scope["headers"])
+        try:
+            body = await self._read_body(receive, headers)
+            if self.service.blocking or scope["path"] in THREADED_ROUTES:
+                # Session lookups wait on the shared backend; keep them off the event loop
+                payload = await asyncio.to_thread(self.dispatch, scope["method"], scope["path"], body)
+            else:
+                payload = self.dispatch(scope["method"], scope["path"], body)
+            status = 200
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception:
+            # Still answer, so the client is not left waiting on a response that never starts
+            log.exception("%s %s failed", scope["method"], scope["path"])
+            status, payload = 500, {"error": "internal server error"}
+        await self._respond(send, status, payload, headers)
+        metrics.HANDLER_SECONDS.observe(time.perf_counter() - start, self._handler_name(scope["path"]))
+
+    def dispatch(self, method, path, body):
+        if method == "GET" and path.startswith("/v1/sessions/") and path.endswith("/stats"):
+            session = path[len("/v1/sessions/"):-len("/stats")]
+            if not session or "/" in session:
+                raise HTTPError(404, "not found")
+            return {"session": session, **self.service.stats(session)}
+        handler = self.routes.get((method, path))
+        if handler is None:
+            allowed = any(route_path == path for _, route_path in self.routes)
+            raise HTTPError(405 if allowed else 404, "method not allowed" if allowed else "not found")
+        return handler(body)
+
+    def _handler_name(self, path):
+        # Route templates only, so a client cannot create a metric series per path
+        if path.startswith("/v1/sessions/") and path.endswith("/stats"):
+            return "/v1/sessions/{session}/stats"
+        return path if any(route_path == path for _, route_path in self.routes) else "other"
+
+    def categories(self, body):
+        return {"categories": self.service.categories()}
+
+    def questions(self, body):
+        session = _session(body)
+        category = self._category(body)
+        count = _int(body, "count", 1, 1, MAX_QUESTIONS)
+        progress = body.get("progress", [])
+        error = self.service.progress_error(progress)
+        if error is not None:
+            raise HTTPError(400, error)
+        drill = body.get("drill") or {}
+        if not (isinstance(drill, dict) and all(d in DIMENSIONS and isinstance(v, str) for d, v in drill.items())):
+            raise HTTPError(400, f"drill must map some of {list(DIMENSIONS)} to feature values")
+        cursor = body.get("cursor")
+        if cursor is not None and not (
+                category == MIXED_CATEGORY and isinstance(cursor, list) and len(cursor) == 2
+                and all(isinstance(v, int) and not isinstance(v, bool) and v >= 0 for v in cursor)):
+            raise HTTPError(400, f"cursor must be [seed, position] from an earlier {MIXED_CATEGORY} response")
+        adaptive = bool(body.get("adaptive", False))
+
+        # Everything is valid: only now change the session, so a rejected request can be retried as is
+        consumed = self.service.apply_progress(session, progress)
+        if cursor is not None:
+            self.service.resume_mixed(session, cursor)
+        batch = self.service.question_batch(session, category, count, adaptive, drill)
+        response = {
+            "session": session,
+            "consumed": consumed,
+            "questions": [
+                {"category": q[0], "item": q[1], "root": q[2], "translation": q[3]}
+                for q in batch
+            ],
+        }
+        if category == MIXED_CATEGORY:
+            response["cursor"] = self.service.mixed_cursor(session)
+        return response
+
+    def grade(self, body):
+        session = _session(body)
+        return {"session": session, **self._grade_one(session, body)}
+
+    def grade_batch(self, body):
+        session = _session(body)
+        answers = body.get("answers")
+        if not isinstance(answers, list) or len(answers) > MAX_BATCH:
+            raise HTTPError(400, f"answers must be a list of at most {MAX_BATCH} answers")
+        for answer in answers:
+            if not isinstance(answer, dict):
+                raise HTTPError(400, "each answer must be an object")
+            self._example(answer)
+            self._answer(answer)
+        return {"session": session, "results": [self._grade_one(session, answer) for answer in answers]}
+
+    def learner(self, body):
+        session = _session(body)
+        learner = body.get("learner")
+        if not isinstance(learner, str) or not learner.strip():
+            raise HTTPError(400, "learner must be a non-empty string")
+        return {"session": session, **self.service.attach_learner(session, learner)}
+
+    def _category(self, body):
+        category = body.get("category")
+        if category not in self.service.categories():
+            raise HTTPError(400, f"unknown category {category!r}")
+        return category
+
+    def _example(self, body):
+        category = self._category(body)
+        _int(body, "item", None, 0, len(self.service.examples_for(category)) - 1)
+        return category, body["item"]
+
+    def _answer(self, body):
+        answer = body.get("answer")
+        if not isinstance(answer, str):
+            raise HTTPError(400, "answer must be a string")
+        return answer
+
+    def _grade_one(self, session, body):
+        category, item = self._example(body)
+        answer = self._answer(body)
+        outcome, (root, form, explanation, _) = self.service.grade(
+            session, category, item, answer, bool(body.get("tolerant", False)))
+        return {
+            "correct": outcome.correct,
+            "error": outcome.error,
+            "hint": outcome.hint,
+            "expected": form,
+            "explanation": explanation,
+        }
+
+    async def _read_body(self, receive, headers):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY:
+                raise HTTPError(413, "request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        raw = b"".join(chunks)
+        if not raw:
+            return {}
+        try:
+            if headers.get(b"content-encoding") == b"gzip":
+                # MAX_BODY applies to the decompressed body too, so a small upload cannot expand to gigabytes
+                inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                raw = inflater.decompress(raw, MAX_BODY)
+                if inflater.unconsumed_tail or len(inflater.decompress(b"", 1)):
+                    raise HTTPError(413, "request body too large")
+                if not inflater.eof:
+                    raise ValueError("truncated gzip body")
+            body = json.loads(raw)
+        except (ValueError, zlib.error):
+            raise HTTPError(400, "body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return body
+
+    async def _respond(self, send, status, payload, headers):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        response_headers = [(b"content-type", b"application/json; charset=utf-8"), (b"vary", b"accept-encoding")]
+        if len(body) >= GZIP_MIN_SIZE and b"gzip" in headers.get(b"accept-encoding", b""):
+            body = gzip.compress(body, GZIP_LEVEL)
+            response_headers.append((b"content-encoding", b"gzip"))
+        response_headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _respond_text(self, send, text):
+        body = text.encode("utf-8")
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", metrics.CONTENT_TYPE.encode()), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.service.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def __getattr__(name):
+    # turkish_quiz.api:app is built on first use, so importing the module opens no lexicon,
+    # event log or progress database
+    global app
+    if name == "app":
+        app = QuizAPI()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes")
+    args = parser.parse_args()
+    if args.workers > 1 and not os.environ.get(STATE_URL_ENV):
+        parser.error(f"--workers needs a shared session backend in ${STATE_URL_ENV}, e.g. sqlite:///state.db")
+    # Workers import the app themselves, so it is passed by name
+    uvicorn.run(QuizAPI() if args.workers == 1 else "turkish_quiz.api:app", host=args.host, port=args.port,
+                workers=args.workers, timeout_keep_alive=KEEP_ALIVE, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
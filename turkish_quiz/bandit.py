@@ -0,0 +1,177 @@
+"""Adaptive question order by Thompson sampling.
+
+Every item in a deck has a Beta posterior over the chance the learner gets
+it right, starting from Beta(1, 1). To pick questions, one success
+probability is drawn from each posterior and the items whose draw is
+closest to TARGET_SUCCESS are asked: an item the learner will probably get
+wrong, or certainly get right, teaches less than one they are unsure of,
+and the random draw keeps rarely asked items coming back.
+
+With numpy the posteriors live in float32 arrays and each draw uses the
+posterior's normal approximation, so picking a batch is a few vectorised
+operations (about half a millisecond for 50,000 items) and an answer
+updates one slot. Without numpy the same is done with exact Beta draws in
+a Python loop, which is fine for decks of a few hundred items. Answers to
+a deck not started yet (drills, mixed quizzes) are kept as item → (alpha,
+beta) until it is, so they never build a deck of their own.
+"""
+
+import math
+import random
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TARGET_SUCCESS = 0.6
+
+
+class BanditDeck:
+    def __init__(self, size, rng=None):
+        self.size = size
+        if np is not None:
+            self.rng = np.random.default_rng() if rng is None else rng
+            self.alpha = np.ones(size, dtype=np.float32)
+            self.beta = np.ones(size, dtype=np.float32)
+            self.mean = np.full(size, 0.5, dtype=np.float32)
+            self.sd = np.full(size, math.sqrt(1 / 12), dtype=np.float32)
+            self.in_flight = np.zeros(size, dtype=bool)
+            self.scores = np.empty(size, dtype=np.float32)
+        else:
+            self.rng = random.Random() if rng is None else rng
+            self.alpha = array("d", [1.0]) * size
+            self.beta = array("d", [1.0]) * size
+            self.in_flight = bytearray(size)
+
+    def take(self, n):
+        n = min(n, self.size)
+        if n <= 0:
+            return []
+        if np is None:
+            betavariate, alpha, beta = self.rng.betavariate, self.alpha, self.beta
+            scores = [
+                math.inf if self.in_flight[i] else abs(betavariate(alpha[i], beta[i]) - TARGET_SUCCESS)
+                for i in range(self.size)
+            ]
+            items = sorted(range(self.size), key=scores.__getitem__)[:n]
+            items = [i for i in items if scores[i] != math.inf]
+        else:
+            # scores = |mean + sd * z - target|, in place
+            scores = self.rng.standard_normal(self.size, dtype=np.float32, out=self.scores)
+            scores *= self.sd
+            scores += self.mean
+            scores -= TARGET_SUCCESS
+            np.abs(scores, out=scores)
+            scores[self.in_flight] = np.inf
+            if n == 1:
+                items = [int(scores.argmin())]
+            else:
+                picked = np.argpartition(scores, n - 1)[:n]
+                picked = picked[np.argsort(scores[picked])]
+                items = picked.tolist()
+            items = [i for i in items if scores[i] != np.inf]
+        for item in items:
+            self.in_flight[item] = 1
+        return items
+
+    def record(self, item, correct):
+        if not 0 <= item < self.size:
+            return
+        self.in_flight[item] = 0
+        if correct:
+            self.set(item, self.alpha[item] + 1, self.beta[item])
+        else:
+            self.set(item, self.alpha[item], self.beta[item] + 1)
+
+    def set(self, item, a, b):
+        """Give `item` the posterior Beta(a, b)."""
+        self.alpha[item] = a
+        self.beta[item] = b
+        if np is not None:
+            a, b = float(a), float(b)
+            self.mean[item] = a / (a + b)
+            self.sd[item] = math.sqrt(a * b / ((a + b) ** 2 * (a + b + 1)))
+
+    def skip(self, item):
+        if 0 <= item < self.size:
+            self.in_flight[item] = 0
+
+    def dump(self):
+        """Only the items with answers or in flight; every other item is at the prior."""
+        if np is not None:
+            answered = np.flatnonzero((self.alpha != 1) | (self.beta != 1)).tolist()
+            in_flight = np.flatnonzero(self.in_flight).tolist()
+        else:
+            answered = [i for i in range(self.size) if self.alpha[i] != 1 or self.beta[i] != 1]
+            in_flight = [i for i in range(self.size) if self.in_flight[i]]
+        return {
+            "size": self.size,
+            "answered": [[i, float(self.alpha[i]), float(self.beta[i])] for i in answered],
+            "in_flight": in_flight,
+        }
+
+    @classmethod
+    def load(cls, data, rng=None):
+        deck = cls(data["size"], rng)
+        for item, a, b in data["answered"]:
+            deck.set(item, a, b)
+        for item in data["in_flight"]:
+            deck.in_flight[item] = 1
+        return deck
+
+
+class ThompsonScheduler:
+    """One learner's posteriors, one deck per suffix category; same calls as LeitnerScheduler."""
+
+    def __init__(self, rng=None):
+        self.rng = rng
+        self.decks = {}
+        self.pending = {}  # deck name → {item: [alpha, beta]}, answers to decks not started yet
+        self.lock = threading.Lock()
+
+    def _deck(self, deck_name, size):
+        deck = self.decks.get(deck_name)
+        if deck is None or deck.size != size:
+            deck = self.decks[deck_name] = BanditDeck(size, self.rng)
+            for item, (a, b) in self.pending.pop(deck_name, {}).items():
+                if item < size:
+                    deck.set(item, a, b)
+        return deck
+
+    def next_items(self, deck_name, size, n):
+        """Indexes of up to `n` items to ask next from a deck of `size` items."""
+        with self.lock:
+            return self._deck(deck_name, size).take(n)
+
+    def record(self, correct, deck_name=None, item=None, size=None):
+        """Update an item's posterior; given the deck's `size`, one for a deck not started yet is kept aside."""
+        with self.lock:
+            deck = self.decks.get(deck_name)
+            if deck is not None and size in (None, deck.size):
+                deck.record(item, correct)
+            elif size is not None and 0 <= item < size:
+                a, b = self.pending.setdefault(deck_name, {}).get(item, (1.0, 1.0))
+                self.pending[deck_name][item] = [a + 1, b] if correct else [a, b + 1]
+
+    def skip(self, deck_name, item):
+        with self.lock:
+            deck = self.decks.get(deck_name)
+            if deck is not None:
+                deck.skip(item)
+
+    def dump(self):
+        with self.lock:
+            return {
+                "decks": {name: deck.dump() for name, deck in self.decks.items()},
+                "pending": {name: [[item, *posterior] for item, posterior in answers.items()]
+                            for name, answers in self.pending.items()},
+            }
+
+    def load(self, data):
+        with self.lock:
+            self.decks = {name: BanditDeck.load(deck, self.rng) for name, deck in data["decks"].items()}
+            self.pending = {name: {item: [a, b] for item, a, b in answers}
+                            for name, answers in data["pending"].items()}
@@ -0,0 +1,224 @@
+"""Grade homework spreadsheets: CSV rows of (student, root, category, answer).
+
+The input is read as chunks of raw lines, and worker processes parse,
+grade and re-format them, with at most two chunks per worker in flight, so
+memory stays flat however long the file is and the parent only moves text.
+Graded rows are written out in input order. Each worker builds the
+(root, category) → answer key once. Within a chunk every distinct lookup
+and every distinct (answer, expected, root) triple is graded once: a class's
+answers repeat a lot, so most rows cost a few dict lookups.
+
+    python -m turkish_quiz.batch_grade homework.csv --out graded.csv --report report.csv
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .compiled_lexicon import open_lexicon
+from .matcher import HINTS, grade, turkish_casefold
+
+CHUNK_ROWS = 20_000
+COLUMNS = ("student", "root", "category", "answer")
+GRADED_COLUMNS = COLUMNS + ("correct", "expected", "error", "hint")
+REPORT_COLUMNS = ("student", "answered", "correct", "score", "unknown", "most_common_error", "hint")
+UNKNOWN = "unknown"
+UNKNOWN_HINT = "Root or category not in the lexicon"
+
+_key = None  # (root, category) → (form, explanation), one per worker process
+_options = None
+
+
+def answer_key(lexicon=None):
+    """{(root, lowercase category): (form, explanation)} for every lexicon entry."""
+    lexicon = open_lexicon() if lexicon is None else lexicon
+    return {
+        (root, category.lower()): (form, explanation)
+        for category in lexicon
+        for root, form, explanation, _ in lexicon[category]
+    }
+
+
+def grade_rows(rows, key, tolerant=False, max_typos=0):
+    """Grade (student, root, category, answer) rows; returns (graded rows, {student: tally}).
+
+    A tally is [answered, correct, unknown, Counter of error labels].
+    """
+    graded, tallies, lookups, memo = [], {}, {}, {}
+    for student, root, category, answer in rows:
+        tally = tallies.get(student)
+        if tally is None:
+            tally = tallies[student] = [0, 0, 0, Counter()]
+        tally[0] += 1
+        expected = lookups.get((root, category), False)
+        if expected is False:
+            expected = lookups[root, category] = key.get((turkish_casefold(root.strip()), category.strip().lower()))
+        if expected is None:
+            tally[2] += 1
+            graded.append((student, root, category, answer, "", "", UNKNOWN, UNKNOWN_HINT))
+            continue
+        form = expected[0]
+        # The diagnosis depends on where the root ends, so the root is part of the key
+        outcome = memo.get((answer, form, root))
+        if outcome is None:
+            outcome = memo[answer, form, root] = grade(answer, form, root, tolerant, max_typos)
+        if outcome.correct:
+            tally[1] += 1
+        if outcome.error:
+            tally[3][outcome.error] += 1
+        graded.append((student, root, category, answer, int(outcome.correct), form,
+                       outcome.error or "", outcome.hint))
+    return graded, tallies
+
+
+def _init_worker(tolerant, max_typos):
+    global _key, _options
+    _key = answer_key()
+    _options = (tolerant, max_typos)
+
+
+def column_order(header):
+    """Indexes of COLUMNS in `header`, or None when the row is not a header."""
+    names = [name.strip().lower() for name in header]
+    if not set(COLUMNS) <= set(names):
+        return None
+    return [names.index(name) for name in COLUMNS]
+
+
+def parse_rows(lines, order):
+    width = max(order) + 1
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        yield tuple(row[i] for i in order)
+
+
+def _grade_chunk(lines, order):
+    graded, tallies = grade_rows(parse_rows(lines, order), _key, *_options)
+    out = io.StringIO()
+    csv.writer(out).writerows(graded)
+    return out.getvalue(), len(graded), tallies
+
+
+def _line_chunks(f, size):
+    while True:
+        lines = list(islice(f, size))
+        if not lines:
+            return
+        # Never split a quoted field that spans lines
+        while sum(line.count('"') for line in lines) % 2:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+        yield lines
+
+
+def _graded_chunks(chunks, order, tolerant, max_typos, workers):
+    if workers == 1:
+        _init_worker(tolerant, max_typos)
+        for lines in chunks:
+            yield _grade_chunk(lines, order)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tolerant, max_typos)) as pool:
+        # A bounded window of chunks in flight, so a huge file is never read ahead into memory
+        pending = deque()
+        for lines in chunks:
+            pending.append(pool.submit(_grade_chunk, lines, order))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def merge_tallies(totals, tallies):
+    for student, (answered, correct, unknown, errors) in tallies.items():
+        total = totals.get(student)
+        if total is None:
+            totals[student] = [answered, correct, unknown, errors]
+        else:
+            total[0] += answered
+            total[1] += correct
+            total[2] += unknown
+            total[3].update(errors)
+
+
+def write_report(totals, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+        for student in sorted(totals):
+            answered, correct, unknown, errors = totals[student]
+            graded = answered - unknown
+            error, hint = "", ""
+            if errors:
+                error = errors.most_common(1)[0][0]
+                hint = HINTS.get(error, "")
+            score = f"{correct / graded:.0%}" if graded else ""
+            writer.writerow((student, answered, correct, score, unknown, error, hint))
+
+
+def grade_csv(in_path, out_path, report_path, tolerant=False, max_typos=0, workers=None, chunk_rows=CHUNK_ROWS):
+    """Grade the CSV at `in_path`, writing graded rows and a per-student report; returns a summary."""
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if os.path.getsize(in_path) < chunk_rows * 32:
+        # Not worth starting worker processes for a file of about one chunk
+        workers = 1
+    totals = {}
+    rows = 0
+    with open(in_path, newline="", encoding="utf-8-sig") as f_in, \
+            open(out_path, "w", newline="", encoding="utf-8") as f_out:
+        f_out.write(",".join(GRADED_COLUMNS) + "\r\n")
+        chunks = _line_chunks(f_in, chunk_rows)
+        first = next(chunks, [])
+        header = next(csv.reader(first[:1]), [])
+        order = column_order(header)
+        if order is None:
+            order = list(range(len(COLUMNS)))
+        else:
+            first = first[1:]
+
+        def all_chunks():
+            yield first
+            yield from chunks
+
+        for text, count, tallies in _graded_chunks(all_chunks(), order, tolerant, max_typos, workers):
+            f_out.write(text)
+            merge_tallies(totals, tallies)
+            rows += count
+    write_report(totals, report_path)
+    return {
+        "rows": rows,
+        "students": len(totals),
+        "correct": sum(total[1] for total in totals.values()),
+        "unknown": sum(total[2] for total in totals.values()),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", help="rows of student, root, category, answer")
+    parser.add_argument("--out", default="graded.csv", help="every row with its grade")
+    parser.add_argument("--report", default="report.csv", help="one row per student")
+    parser.add_argument("--tolerant", action="store_true", help="accept c, s, g, i, o, u for ç, ş, ğ, ı, ö, ü")
+    parser.add_argument("--max-typos", type=int, default=0, help="accept answers this many edits away")
+    parser.add_argument("--workers", type=int, help="grading processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    summary = grade_csv(args.csv, args.out, args.report, args.tolerant, args.max_typos, args.workers)
+    print(f"graded {summary['rows']} rows for {summary['students']} students in {summary['seconds']}s: "
+          f"{summary['correct']} correct, {summary['unknown']} not in the lexicon", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
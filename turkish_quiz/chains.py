@@ -0,0 +1,72 @@
+"""Suffix chains: plural, possessive and case stacked on one noun (ev → evlerimden).
+
+A chain is inflected one suffix at a time, each step re-reading the features
+of the stem it produced. Results are memoized per (root, chain prefix), so
+the stems of a shared prefix such as ev → evler → evlerim are computed once
+for every chain that starts with it. Questions are decoded from an index on
+demand and streamed from a generator; the full set of chains is never built.
+"""
+
+import random
+from collections.abc import Sequence
+from functools import lru_cache
+
+from .lexicon import chain_translation, load_roots
+from .morphology import NOUN, features, inflect
+
+CHAIN_CATEGORY = "Suffix Chain"
+CHAINS = (
+    ("Plural", "Possessive"),
+    ("Plural", "Locative"),
+    ("Plural", "Ablative"),
+    ("Possessive", "Locative"),
+    ("Possessive", "Ablative"),
+    ("Plural", "Possessive", "Locative"),
+    ("Plural", "Possessive", "Ablative"),
+)
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def inflect_chain(root, feats, chain):
+    """Return (form, steps) for `root` with `chain` applied; steps are (stem, explanation) per suffix."""
+    if len(chain) > 1:
+        stem, steps = inflect_chain(root, feats, chain[:-1])
+        # Suffixed stems end in r, m or z, so they never soften
+        feats = features(stem, False)
+    else:
+        stem, steps = root, ()
+    form, explanation = inflect(stem, chain[-1], feats)
+    return form, steps + ((form, explanation),)
+
+
+class ChainExamples(Sequence):
+    """Every (noun, chain) pair as a (root, form, explanation, translation) tuple, built on access."""
+
+    def __init__(self, roots=None, chains=CHAINS):
+        if roots is None:
+            roots = load_roots()
+        self.nouns = [r for r in roots if r.pos == NOUN]
+        self.chains = chains
+
+    def __len__(self):
+        return len(self.nouns) * len(self.chains)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chain index out of range")
+        noun, chain = divmod(index, len(self.chains))
+        r, chain = self.nouns[noun], self.chains[chain]
+        form, steps = inflect_chain(r.root, r.features, chain)
+        explanation = "; ".join(f"{stem}: {step}" for stem, step in steps)
+        return r.root, form, explanation, chain_translation(chain, r.gloss)
+
+    def stream(self, rng=random):
+        """Endless (index, example) pairs in random order."""
+        while True:
+            index = rng.randrange(len(self))
+            yield index, self[index]
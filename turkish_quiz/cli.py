@@ -0,0 +1,79 @@
+"""Terminal quiz: `turkish-quiz` or `python -m turkish_quiz`. Does not need gradio."""
+
+from .compiled_lexicon import open_lexicon
+from .matcher import grade
+from .mixed import MixedQuiz, new_seed
+
+def run_quiz(examples_dict):
+    """Runs a quiz based on the provided dictionary of suffix examples."""
+    score = 0
+    # Shuffled lazily, one question at a time, rather than as a list of every entry
+    mixed = MixedQuiz(examples_dict, new_seed())
+
+    total_questions = len(mixed)
+
+    print("--- Turkish Suffix Quiz ---")
+    print(f"Let's test your knowledge on {len(examples_dict)} types of suffixes.")
+    print("Enter the correct suffixed form for each word and category.")
+    print("Type 'hint' for the rule, or 'quit' to exit.\n")
+
+    question_number = 0
+    for category, _, (base_word, correct_suffixed, explanation, _) in mixed.stream():
+        question_number += 1
+        attempts = 0
+        while attempts < 2: # Allow one hint request
+            prompt = f"Q{question_number}/{total_questions} ({category}): '{base_word}' -> ? "
+            user_answer = input(prompt).strip() # Get input and remove leading/trailing spaces
+
+            if user_answer.lower() == 'quit':
+                print("\nExiting quiz.")
+                return score, question_number -1 # Return current score and number answered
+
+            if user_answer.lower() == 'hint':
+                if attempts == 0:
+                    print(f"   Hint: {explanation}")
+                    attempts += 1 # Use up the hint attempt
+                    continue # Ask the same question again
+                else:
+                    print("   You already used your hint for this question.")
+                    continue # Ask again without counting as a new attempt
+
+            # Compare answers with Turkish casefolding (I/ı, İ/i), so capitalised answers still count
+            result = grade(user_answer, correct_suffixed, base_word)
+            if result.correct:
+                print(f"Correct! It's '{correct_suffixed}'.")
+                score += 1
+                break # Move to the next question
+            else:
+                print(f"Incorrect.")
+                if result.hint:
+                    print(f"   {result.hint}")
+                # On the final attempt (or if no hint was used)
+                if attempts == 0: # Give feedback immediately if no hint was requested
+                     print(f"   The correct answer is: {correct_suffixed}")
+                     print(f"   Rule was: {explanation}")
+                     break # Move to next question after incorrect guess without hint
+                # If hint was used and still wrong
+                elif attempts == 1:
+                    print(f"   The correct answer is: {correct_suffixed}")
+                    break # Move to next question after hint + incorrect guess
+
+
+            print("-" * 15) # Separator between questions
+
+    print("\n--- Quiz Finished ---")
+    print(f"Your final score: {score} out of {question_number} questions attempted.")
+    if question_number > 0:
+        percentage = (score / question_number) * 100
+        print(f"Percentage: {percentage:.2f}%")
+    else:
+        print("No questions were attempted.")
+
+def main():
+    # Questions are generated from roots.tsv; add roots there to extend the quiz.
+    final_score, questions_done = run_quiz(open_lexicon())
+    print("\nQuiz session ended.")
+
+# --- Run the Quiz ---
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Columnar in-memory lexicon.
+
+A dict of lists of (root, form, explanation, translation) tuples costs four
+str objects and a tuple per entry, over 250 bytes, although a lexicon has
+only a few hundred distinct explanations. ColumnarLexicon keeps instead:
+
+    roots, forms                packed UTF-8 bytes, with an end-offset array each
+    explanations, translations  interned string tables (packed the same way),
+                                referenced by integer ids
+    categories                  an array of entry ids per category
+
+which is about 50 bytes an entry. It has the same interface as
+CompiledLexicon, for lexicons built in memory rather than mapped from
+lexicon.bin, and entries are decoded into the usual tuple when asked for.
+"""
+
+import random
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+
+class _StringTable:
+    """Distinct strings, packed, with the lookup used to intern them kept only while building."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ends = array("I")
+        self.ids = {}
+
+    def id(self, value):
+        if self.ids is None:
+            self.ids = {self[i]: i for i in range(len(self.ends))}
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.ends)
+            self.data += value.encode("utf-8")
+            self.ends.append(len(self.data))
+        return value_id
+
+    def __getitem__(self, value_id):
+        start = self.ends[value_id - 1] if value_id else 0
+        return self.data[start:self.ends[value_id]].decode("utf-8")
+
+    def freeze(self):
+        self.ids = None
+
+    def nbytes(self):
+        return sys.getsizeof(self.data) + sys.getsizeof(self.ends)
+
+
+class ColumnEntries(Sequence):
+    """Read-only sequence of the entries of one category."""
+
+    def __init__(self, lexicon, entry_ids):
+        self._lexicon = lexicon
+        self._entry_ids = entry_ids
+
+    def __len__(self):
+        return len(self._entry_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._lexicon.entry(i) for i in self._entry_ids[index]]
+        return self._lexicon.entry(self._entry_ids[index])
+
+
+class ColumnarLexicon(Mapping):
+    def __init__(self):
+        self._roots = bytearray()
+        self._root_ends = array("I")
+        self._forms = bytearray()
+        self._form_ends = array("I")
+        self._explanation_ids = array("I")
+        self._translation_ids = array("I")
+        self._explanations = _StringTable()
+        self._translations = _StringTable()
+        self._categories = {}  # name → array of entry ids
+        self._views = {}
+
+    @classmethod
+    def from_examples(cls, suffix_examples):
+        """Columnar copy of {category: [(root, form, explanation, translation), ...]}."""
+        lexicon = cls()
+        for category, items in suffix_examples.items():
+            lexicon.add_category(category)
+            for item in items:
+                lexicon.add(category, *item[:4])
+        lexicon.freeze()
+        return lexicon
+
+    def add_category(self, category):
+        if category not in self._categories:
+            self._categories[category] = array("I")
+            self._views[category] = ColumnEntries(self, self._categories[category])
+
+    def add(self, category, root, form, explanation, translation):
+        entry_ids = self._categories.get(category)
+        if entry_ids is None:
+            self.add_category(category)
+            entry_ids = self._categories[category]
+        entry_ids.append(len(self._root_ends))
+        self._roots += root.encode("utf-8")
+        self._root_ends.append(len(self._roots))
+        self._forms += form.encode("utf-8")
+        self._form_ends.append(len(self._forms))
+        self._explanation_ids.append(self._explanations.id(explanation))
+        self._translation_ids.append(self._translations.id(translation))
+
+    def entry(self, entry_id):
+        root_start = self._root_ends[entry_id - 1] if entry_id else 0
+        form_start = self._form_ends[entry_id - 1] if entry_id else 0
+        return (
+            self._roots[root_start:self._root_ends[entry_id]].decode("utf-8"),
+            self._forms[form_start:self._form_ends[entry_id]].decode("utf-8"),
+            self._explanations[self._explanation_ids[entry_id]],
+            self._translations[self._translation_ids[entry_id]],
+        )
+
+    def freeze(self):
+        """Drop the interning lookups once every entry is in; add() rebuilds them if needed."""
+        self._explanations.freeze()
+        self._translations.freeze()
+
+    def random_entry(self, category):
+        return random.choice(self._views[category])
+
+    def __getitem__(self, category):
+        return self._views[category]
+
+    def __iter__(self):
+        return iter(self._views)
+
+    def __len__(self):
+        return len(self._views)
+
+    def nbytes(self):
+        """Memory held by the columns and string tables, in bytes, once frozen."""
+        columns = (self._roots, self._root_ends, self._forms, self._form_ends,
+                   self._explanation_ids, self._translation_ids, *self._categories.values())
+        return (sum(sys.getsizeof(column) for column in columns)
+                + self._explanations.nbytes() + self._translations.nbytes())
+
+    def close(self):
+        pass
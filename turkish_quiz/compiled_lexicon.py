@@ -0,0 +1,201 @@
+"""Compiled, memory-mapped lexicon.
+
+`python -m turkish_quiz.compiled_lexicon` turns roots.tsv into lexicon.bin:
+
+    header      magic, version, category/string/entry counts, engine fingerprint
+    categories  (name id, first entry, entry count) per category
+    entries     (root id, form id, explanation id, translation id) per entry
+    offsets     n_strings + 1 byte offsets into the string blob
+    strings     interned UTF-8 strings, each stored once
+
+Readers map the file with `mmap`, so every worker process shares the same
+page cache and opening a lexicon costs the same whatever its size. Entries
+are only decoded when a question is asked for.
+
+lexicon.bin is rebuilt when roots.tsv is newer, or when its fingerprint of
+the engine (lexicon.py and morphology.py) no longer matches, so a change to
+the rules or translations is never served from a stale file.
+"""
+
+import hashlib
+import mmap
+import os
+import random
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+
+from . import lexicon, morphology
+from .lexicon import ROOTS_PATH, build_columnar_lexicon, build_suffix_examples, load_roots
+
+LEXICON_PATH = os.path.join(os.path.dirname(ROOTS_PATH), "lexicon.bin")
+# Used instead when the package directory is read-only, as in a system-wide install
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "turkish_quiz")
+
+MAGIC = b"TSQL"
+VERSION = 2
+HEADER = struct.Struct("<4sHHII8s")
+CATEGORY = struct.Struct("<III")
+ENTRY = struct.Struct("<IIII")
+OFFSET = struct.Struct("<II")
+
+
+def engine_fingerprint():
+    """Hash of the code that generates entries; lexicon.bin is rebuilt when it changes."""
+    digest = hashlib.blake2b(digest_size=8)
+    for module in (lexicon, morphology):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def compile_lexicon(suffix_examples, path=LEXICON_PATH, fingerprint=None):
+    """Write {category: [(root, form, explanation, translation), ...]} to `path`."""
+    if fingerprint is None:
+        fingerprint = engine_fingerprint()
+    strings = {}
+
+    def intern(s):
+        if s not in strings:
+            strings[s] = len(strings)
+        return strings[s]
+
+    categories = bytearray()
+    entries = bytearray()
+    n_entries = 0
+    for category, items in suffix_examples.items():
+        categories += CATEGORY.pack(intern(category), n_entries, len(items))
+        for item in items:
+            entries += ENTRY.pack(*(intern(s) for s in item[:4]))
+        n_entries += len(items)
+
+    blob = bytearray()
+    offsets = bytearray(struct.pack("<I", 0))
+    for s in strings:
+        blob += s.encode("utf-8")
+        offsets += struct.pack("<I", len(blob))
+
+    # Write next to the target and rename, so readers never map a partial file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(suffix_examples), len(strings), n_entries, fingerprint))
+            f.write(categories)
+            f.write(entries)
+            f.write(offsets)
+            f.write(blob)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class CategoryEntries(Sequence):
+    """Read-only sequence of the entries of one category."""
+
+    def __init__(self, lexicon, first, count):
+        self._lexicon = lexicon
+        self._first = first
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("entry index out of range")
+        return self._lexicon.entry(self._first + index)
+
+
+class CompiledLexicon(Mapping):
+    """Mapping of category → entries backed by a memory-mapped lexicon.bin.
+
+    It stands in for the `suffix_examples` dict: `random.choice(lex[category])`
+    decodes exactly one entry.
+    """
+
+    def __init__(self, path=LEXICON_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_categories, n_strings, n_entries, self.fingerprint = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} compiled lexicon")
+
+        self._entries_at = HEADER.size + n_categories * CATEGORY.size
+        self._offsets_at = self._entries_at + n_entries * ENTRY.size
+        self._strings_at = self._offsets_at + (n_strings + 1) * 4
+        self._categories = {}
+        for i in range(n_categories):
+            name_id, first, count = CATEGORY.unpack_from(self._mm, HEADER.size + i * CATEGORY.size)
+            self._categories[self.string(name_id)] = CategoryEntries(self, first, count)
+
+    def string(self, string_id):
+        start, end = OFFSET.unpack_from(self._mm, self._offsets_at + string_id * 4)
+        return self._mm[self._strings_at + start:self._strings_at + end].decode("utf-8")
+
+    def entry(self, entry_id):
+        ids = ENTRY.unpack_from(self._mm, self._entries_at + entry_id * ENTRY.size)
+        return tuple(self.string(i) for i in ids)
+
+    def random_entry(self, category):
+        return random.choice(self._categories[category])
+
+    def __getitem__(self, category):
+        return self._categories[category]
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def close(self):
+        self._mm.close()
+
+
+def _stale(path, roots_path, fingerprint):
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(roots_path):
+            return True
+        with open(path, "rb") as f:
+            magic, version, _, _, _, built_with = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return True
+    return magic != MAGIC or version != VERSION or built_with != fingerprint
+
+
+def open_lexicon(path=LEXICON_PATH, roots_path=ROOTS_PATH):
+    """Open the compiled lexicon, (re)building it first if roots.tsv or the engine changed.
+
+    With nowhere to write lexicon.bin, the lexicon is built in memory instead.
+    """
+    fingerprint = engine_fingerprint()
+    if _stale(path, roots_path, fingerprint):
+        try:
+            compile_lexicon(build_suffix_examples(load_roots(roots_path)), path, fingerprint)
+        except OSError:
+            # Read-only package directory (EACCES, or EROFS on a read-only filesystem)
+            path = os.path.join(CACHE_DIR, os.path.basename(path))
+            if _stale(path, roots_path, fingerprint):
+                try:
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    compile_lexicon(build_suffix_examples(load_roots(roots_path)), path, fingerprint)
+                except OSError:
+                    return build_columnar_lexicon(load_roots(roots_path))
+    return CompiledLexicon(path)
+
+
+if __name__ == "__main__":
+    roots_path = sys.argv[1] if len(sys.argv) > 1 else ROOTS_PATH
+    out_path = sys.argv[2] if len(sys.argv) > 2 else LEXICON_PATH
+    examples = build_suffix_examples(load_roots(roots_path))
+    compile_lexicon(examples, out_path)
+    total = sum(len(items) for items in examples.values())
+    print(f"Wrote {total} entries in {len(examples)} categories to {out_path}")
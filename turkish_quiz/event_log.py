@@ -0,0 +1,288 @@
+"""Append-only log of quiz events, with compaction to a columnar file.
+
+Handlers call EventLog.log(), which only puts the event on a queue; a
+background writer appends batches of them as JSON lines to numbered segment
+files and starts a new segment once the current one reaches `max_bytes`.
+Every run of the app starts a fresh segment, and each process writes its
+own segments, so several app workers can share one events directory. A
+segment is named events-NNNNNN.jsonl.open while its writer has it open and
+renamed to events-NNNNNN.jsonl once the writer rotates away from it or
+closes.
+
+Compaction turns the finished segments into one columnar file, leaving the
+open ones to their writers: each column is stored separately and
+zlib-compressed, and text columns are dictionary-encoded, so a column such
+as `root` can be read without touching the others. `--all` takes open
+segments too, for when every app has stopped (or one crashed and left its
+segment open).
+
+    python -m turkish_quiz.event_log compact [events dir]
+    python -m turkish_quiz.event_log summary events/events-000001-000004.col
+"""
+
+import argparse
+import atexit
+import json
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+
+from .progress_store import BatchWriter
+
+EVENTS_DIR = "events"  # relative to the working directory
+MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+
+SEGMENT = re.compile(r"events-(\d{6})\.jsonl(\.open)?$")
+OPEN_SUFFIX = ".open"
+COMPACTED = re.compile(r"events-(\d{6})-(\d{6})\.col$")
+MAGIC = b"TSQCOL1\n"
+HEADER = struct.Struct("<I")
+
+# name, type code, value stored when an event has no such field
+COLUMNS = [
+    ("time", "d", 0.0),
+    ("event", "str", ""),
+    ("session", "str", ""),
+    ("suffix_type", "str", ""),
+    ("item", "i", -1),
+    ("root", "str", ""),
+    ("answer", "str", ""),
+    ("correct", "b", -1),
+]
+
+
+def last_sequence(directory):
+    last = 0
+    for name in os.listdir(directory):
+        match = SEGMENT.match(name)
+        if match:
+            last = max(last, int(match.group(1)))
+        match = COMPACTED.match(name)
+        if match:
+            last = max(last, int(match.group(2)))
+    return last
+
+
+def segment_path(directory, seq):
+    return os.path.join(directory, f"events-{seq:06d}.jsonl")
+
+
+class EventLog:
+    def __init__(self, directory=EVENTS_DIR, max_bytes=MAX_SEGMENT_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._seq = last_sequence(directory)
+        self._file = None
+        self._path = None
+        self._size = 0
+        self.writer = BatchWriter(self._write_batch, name="event-writer")
+        atexit.register(self.close)
+
+    def log(self, event, **fields):
+        fields["time"] = time.time()
+        fields["event"] = event
+        self.writer.put(fields)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+        self._finish()
+
+    def _finish(self):
+        # Closed and renamed, so compaction may take it
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            try:
+                os.rename(self._path + OPEN_SUFFIX, self._path)
+            except FileNotFoundError:
+                pass  # compacted with --all while still open
+
+    def _rotate(self):
+        self._finish()
+        # Other processes, and compaction, may have used numbers since we last looked
+        self._seq = max(self._seq, last_sequence(self.directory))
+        while True:
+            self._seq += 1
+            path = segment_path(self.directory, self._seq)
+            try:
+                # Exclusive create: another process may have taken this number
+                self._file = open(path + OPEN_SUFFIX, "xb")
+            except FileExistsError:
+                continue
+            if not os.path.exists(path):
+                break
+            # ... and already finished the segment
+            self._file.close()
+            os.remove(path + OPEN_SUFFIX)
+        self._path = path
+        self._size = 0
+
+    def _write_batch(self, batch):
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch).encode("utf-8")
+        if self._file is None or (self._size and self._size + len(data) > self.max_bytes):
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+
+def read_segment(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            # A crash can leave the last line half-written
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def write_columns(events, path):
+    """Write `events` (dicts) as a compressed columnar file at `path`; returns the row count."""
+    values = {name: array(code) if code != "str" else array("I") for name, code, _ in COLUMNS}
+    dictionaries = {name: {} for name, code, _ in COLUMNS if code == "str"}
+    rows = 0
+    for event in events:
+        rows += 1
+        for name, code, missing in COLUMNS:
+            value = event.get(name)
+            if value is None:
+                value = missing
+            if code == "str":
+                # NUL separates dictionary entries on disk
+                value = str(value).replace("\0", "")
+                value = dictionaries[name].setdefault(value, len(dictionaries[name]))
+            elif code == "b":
+                value = int(value)
+            values[name].append(value)
+
+    columns, blobs, offset = [], [], 0
+    for name, code, _ in COLUMNS:
+        column = {"name": name, "type": code}
+        parts = [("data", values[name].tobytes())]
+        if code == "str":
+            parts.append(("dictionary", "\0".join(dictionaries[name]).encode("utf-8")))
+        for key, raw in parts:
+            blob = zlib.compress(raw, 9)
+            column[key] = [offset, len(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+        columns.append(column)
+
+    header = json.dumps({"rows": rows, "columns": columns}).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + HEADER.pack(len(header)) + header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return rows
+
+
+def read_columns(path, names=None):
+    """Read columns of a compacted file as {name: list}; all of them unless `names` is given."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a compacted event file")
+        (header_size,) = HEADER.unpack(f.read(HEADER.size))
+        header = json.loads(f.read(header_size))
+        start = f.tell()
+
+        def blob(offset, length):
+            f.seek(start + offset)
+            return zlib.decompress(f.read(length))
+
+        result = {}
+        for column in header["columns"]:
+            if names is not None and column["name"] not in names:
+                continue
+            code = column["type"]
+            data = array("I" if code == "str" else code)
+            data.frombytes(blob(*column["data"]))
+            if code == "str":
+                raw = blob(*column["dictionary"])
+                dictionary = raw.decode("utf-8").split("\0")
+                result[column["name"]] = [dictionary[i] for i in data]
+            else:
+                result[column["name"]] = data.tolist()
+    return result
+
+
+def compact(directory=EVENTS_DIR, include_open=False):
+    """Compact the finished segments in `directory` into one columnar file.
+
+    Segments still open are left to their writers unless `include_open` is
+    set, for when no app is running. Returns the new file's path, or None
+    when there was nothing to compact.
+    """
+    segments = sorted(
+        (int(match.group(1)), os.path.join(directory, name))
+        for name in os.listdir(directory)
+        for match in [SEGMENT.match(name)]
+        if match and (include_open or not match.group(2))
+    )
+    if not segments:
+        return None
+
+    def events():
+        for _, path in segments:
+            yield from read_segment(path)
+
+    path = os.path.join(directory, f"events-{segments[0][0]:06d}-{segments[-1][0]:06d}.col")
+    write_columns(events(), path)
+    for _, segment in segments:
+        os.remove(segment)
+    return path
+
+
+def summary(path, top=10):
+    """Print the failure rate per suffix type and the most-missed roots."""
+    columns = read_columns(path, {"event", "suffix_type", "root", "correct"})
+    attempts, misses = Counter(), Counter()
+    root_attempts, root_misses = Counter(), Counter()
+    for event, suffix_type, root, correct in zip(
+            columns["event"], columns["suffix_type"], columns["root"], columns["correct"]):
+        if event != "answer" or correct < 0:
+            continue
+        attempts[suffix_type] += 1
+        root_attempts[root, suffix_type] += 1
+        if not correct:
+            misses[suffix_type] += 1
+            root_misses[root, suffix_type] += 1
+
+    print(f"{'suffix type':<22}{'answers':>9}{'wrong':>8}")
+    for suffix_type, count in attempts.most_common():
+        print(f"{suffix_type:<22}{count:>9}{misses[suffix_type] / count:>8.0%}")
+    print(f"\n{'most missed':<22}{'answers':>9}{'wrong':>8}")
+    for (root, suffix_type), count in root_misses.most_common(top):
+        print(f"{root + ' / ' + suffix_type:<22}{root_attempts[root, suffix_type]:>9}"
+              f"{count / root_attempts[root, suffix_type]:>8.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    compact_cmd = commands.add_parser("compact", help="compact finished segments into a columnar file")
+    compact_cmd.add_argument("directory", nargs="?", default=EVENTS_DIR)
+    compact_cmd.add_argument("--all", action="store_true", help="include open segments (every app stopped)")
+    summary_cmd = commands.add_parser("summary", help="failure rates from a compacted file")
+    summary_cmd.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        path = compact(args.directory, include_open=args.all)
+        print(path or "nothing to compact", file=sys.stderr if path is None else sys.stdout)
+    else:
+        summary(args.path)
+
+
+if __name__ == "__main__":
+    main()
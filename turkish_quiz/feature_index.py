@@ -0,0 +1,98 @@
+"""Inverted indexes over phonological features, for targeted drills.
+
+For each category, every item is filed under the features of its root and
+the allomorph its form uses:
+
+    final    vowel, voiced, voiceless, and p/ç/t/k for roots that may soften
+    harmony  a/ı, e/i, o/u or ö/ü, the harmony class of the last vowel
+    suffix   the allomorph the form ends with, such as -tan or -ler
+
+Each posting list is a sorted array of item indexes, built the first time a
+category is queried. A drill such as {"final": "voiceless", "suffix": "-tan"}
+intersects its posting lists once and caches the result, so drawing
+questions from a drill afterwards is a constant-time random pick however
+large the lexicon is.
+"""
+
+import re
+import threading
+from array import array
+from collections import OrderedDict
+
+from .lexicon import load_roots
+from .morphology import HARMONY_LABELS, SOFTENING, VOICED, VOWEL, features
+
+DIMENSIONS = ("final", "harmony", "suffix")
+FINAL_LABELS = {VOWEL: "vowel", VOICED: "voiced"}
+SOFTENING_LABEL = "/".join(SOFTENING)
+CACHED_DRILLS = 1024
+
+SUFFIX = re.compile(r"-([a-zçğıöşü]+)")
+
+
+def entry_features(root, form, explanation, feats):
+    """(dimension, value) pairs an entry is filed under."""
+    pairs = [
+        ("final", FINAL_LABELS.get(feats.final, "voiceless")),
+        ("harmony", HARMONY_LABELS[feats.harmony]),
+    ]
+    if root[-1:] in SOFTENING:
+        pairs.append(("final", SOFTENING_LABEL))
+    # The longest suffix named in the explanation that the form really ends with
+    suffixes = [s for s in SUFFIX.findall(explanation) if form.endswith(s)]
+    if suffixes:
+        pairs.append(("suffix", "-" + max(suffixes, key=len)))
+    return pairs
+
+
+class FeatureIndex:
+    def __init__(self, lexicon, roots=None):
+        self.lexicon = lexicon
+        # roots.tsv flags (such as front-vowel loanwords) decide the harmony of known roots
+        self.root_features = {r.root: r.features for r in (load_roots() if roots is None else roots)}
+        self._postings = {}  # category → {(dimension, value): array of item indexes}
+        self._drills = OrderedDict()  # (category, filters) → array of item indexes
+        self._lock = threading.Lock()
+
+    def _category(self, category):
+        postings = self._postings.get(category)
+        if postings is None:
+            postings = {}
+            for item, (root, form, explanation, _) in enumerate(self.lexicon[category]):
+                feats = self.root_features.get(root) or features(root)
+                for key in entry_features(root, form, explanation, feats):
+                    ids = postings.get(key)
+                    if ids is None:
+                        ids = postings[key] = array("I")
+                    ids.append(item)
+            with self._lock:
+                postings = self._postings.setdefault(category, postings)
+        return postings
+
+    def values(self, category, dimension):
+        """The values of `dimension` that some item of `category` has, in sorted order."""
+        return sorted(value for d, value in self._category(category) if d == dimension)
+
+    def query(self, category, filters):
+        """Sorted item indexes of `category` matching every {dimension: value} in `filters`."""
+        key = (category, tuple(sorted(filters.items())))
+        with self._lock:
+            ids = self._drills.get(key)
+            if ids is not None:
+                self._drills.move_to_end(key)
+                return ids
+        postings = self._category(category)
+        lists = sorted((postings.get(pair, ()) for pair in key[1]), key=len)
+        if not lists:
+            ids = array("I", range(len(self.lexicon[category])))
+        elif not lists[0]:
+            ids = array("I")
+        else:
+            # Smallest list first, so the set never holds more than the rarest feature
+            matching = set(lists[0]).intersection(*lists[1:])
+            ids = array("I", sorted(matching))
+        with self._lock:
+            self._drills[key] = ids
+            if len(self._drills) > CACHED_DRILLS:
+                self._drills.popitem(last=False)
+        return ids
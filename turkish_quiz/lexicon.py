@@ -0,0 +1,159 @@
+"""Root lexicon for the quizzes.
+
+Roots live in roots.tsv (root, part of speech, Spanish gloss, flags) and every
+(root, form, explanation, translation) tuple is produced by the morphology
+engine instead of being written out by hand.
+"""
+
+import os
+from collections import namedtuple
+
+from .columnar import ColumnarLexicon
+from .morphology import CATEGORIES, NOUN, RULES, features, inflect
+
+ROOTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roots.tsv")
+
+Root = namedtuple("Root", ["root", "pos", "gloss", "features"])
+
+# Spanish verbs that do not follow the regular -ar/-er/-ir patterns:
+# infinitive → (preterite, present, future, gerund), all third person singular
+IRREGULAR_VERBS = {
+    "ir": ("fue", "va", None, "yendo"),
+    "venir": ("vino", "viene", "vendrá", "viniendo"),
+    "hacer": ("hizo", None, "hará", None),
+    "traer": ("trajo", None, None, "trayendo"),
+    "querer": ("quiso", "quiere", "querrá", None),
+    "saber": ("supo", None, "sabrá", None),
+    "decir": ("dijo", "dice", "dirá", "diciendo"),
+    "dar": ("dio", None, None, None),
+    "ver": ("vio", None, None, None),
+    "leer": ("leyó", None, None, "leyendo"),
+    "dormir": ("durmió", "duerme", None, "durmiendo"),
+    "pensar": (None, "piensa", None, None),
+    "entender": (None, "entiende", None, None),
+    "encontrar": (None, "encuentra", None, None),
+    "empezar": (None, "empieza", None, None),
+    "cerrar": (None, "cierra", None, None),
+    "volver": (None, "vuelve", None, None),
+    "recordar": (None, "recuerda", None, None),
+    "jugar": (None, "juega", None, None),
+}
+ACCENTED = str.maketrans("áéíóú", "aeiou")
+PLURAL_ARTICLES = {"el": "los", "la": "las"}
+
+
+def _plural(noun):
+    if noun[-1] in "aeiouáéó":
+        return noun + "s"
+    if noun.endswith("z"):
+        return noun[:-1] + "ces"
+    # camión → camiones: the stress mark disappears once a syllable is added
+    vowels = [c for c in noun if c in "aeiouáéíóú"]
+    if vowels and vowels[-1] in "áéíóú":
+        head, _, tail = noun.rpartition(vowels[-1])
+        noun = head + vowels[-1].translate(ACCENTED) + tail
+    return noun + "es"
+
+
+def _verb_form(infinitive, index):
+    irregular = IRREGULAR_VERBS.get(infinitive)
+    if irregular and irregular[index]:
+        return irregular[index]
+    stem, ending = infinitive[:-2], infinitive[-2:]
+    if index == 0:
+        return stem + ("ó" if ending == "ar" else "ió")
+    if index == 1:
+        return stem + ("a" if ending == "ar" else "e")
+    if index == 2:
+        return infinitive + "á"
+    return stem + ("ando" if ending == "ar" else "iendo")
+
+
+def spanish_translation(category, gloss):
+    """Spanish rendering of `gloss` ("el libro", "escribir") for `category`."""
+    if RULES[category].pos == NOUN:
+        article, _, noun = gloss.partition(" ")
+        if category == "Plural":
+            return _plural(noun)
+        if category == "Locative":
+            return f"en {gloss}"
+        if category == "Ablative":
+            return f"del {noun}" if article == "el" else f"de {gloss}"
+        return f"mi {noun}"
+    if category == "Past Tense":
+        return _verb_form(gloss, 0)
+    if category == "Conditional":
+        return f"si {_verb_form(gloss, 1)}"
+    if category == "Future":
+        return _verb_form(gloss, 2)
+    return f"está {_verb_form(gloss, 3)}"
+
+
+def chain_translation(chain, gloss):
+    """Spanish rendering of a noun `gloss` with the suffixes in `chain` stacked on it."""
+    article, _, noun = gloss.partition(" ")
+    plural = "Plural" in chain
+    if plural:
+        noun = _plural(noun)
+    if "Possessive" in chain:
+        phrase = f"{'mis' if plural else 'mi'} {noun}"
+    else:
+        phrase = f"{PLURAL_ARTICLES[article]} {noun}" if plural else gloss
+    if "Locative" in chain:
+        return f"en {phrase}"
+    if "Ablative" in chain:
+        return "del " + phrase[3:] if phrase.startswith("el ") else f"de {phrase}"
+    return phrase
+
+
+def load_roots(path=ROOTS_PATH):
+    """Read roots.tsv, precomputing the phonological features of every root."""
+    roots = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            root, pos, gloss, *rest = line.rstrip("\n").split("\t")
+            flags = set(rest[0].split(",")) if rest and rest[0] else set()
+            if "soft" in flags:
+                soften = True
+            elif "hard" in flags or pos != NOUN:
+                soften = False
+            else:
+                soften = None
+            roots.append(Root(root, pos, gloss, features(root, soften, "front" in flags)))
+    return roots
+
+
+def build_suffix_examples(roots=None, categories=CATEGORIES):
+    """Return {category: [(root, form, explanation, translation), ...]}."""
+    if roots is None:
+        roots = load_roots()
+    examples = {}
+    for category in categories:
+        pos = RULES[category].pos
+        items = []
+        for r in roots:
+            if r.pos != pos:
+                continue
+            form, explanation = inflect(r.root, category, r.features)
+            items.append((r.root, form, explanation, spanish_translation(category, r.gloss)))
+        examples[category] = items
+    return examples
+
+
+def build_columnar_lexicon(roots=None, categories=CATEGORIES):
+    """Like build_suffix_examples, into a ColumnarLexicon without a tuple per entry."""
+    if roots is None:
+        roots = load_roots()
+    lexicon = ColumnarLexicon()
+    for category in categories:
+        lexicon.add_category(category)
+        pos = RULES[category].pos
+        for r in roots:
+            if r.pos != pos:
+                continue
+            form, explanation = inflect(r.root, category, r.features)
+            lexicon.add(category, r.root, form, explanation, spanish_translation(category, r.gloss))
+    lexicon.freeze()
+    return lexicon
@@ -0,0 +1,124 @@
+"""Turkish-aware answer matching.
+
+Answers are compared after Turkish casefolding (I → ı, İ → i), optionally
+with the Turkish letters folded to their ASCII look-alikes for learners
+without a Turkish keyboard. Wrong answers are classified in one alignment
+pass (wrong harmony vowel, missed softening, d/t assimilation, missing
+buffer letter) and near misses are measured with Myers' bit-parallel edit
+distance, cut off as soon as the bound is exceeded.
+"""
+
+from collections import namedtuple
+
+from .morphology import VOWELS
+
+CASEFOLD = str.maketrans({"I": "ı", "İ": "i"})
+ASCII_FOLD = str.maketrans("çşğıöü", "csgiou")
+SOFT_PAIRS = ({"p", "b"}, {"ç", "c"}, {"t", "d"}, {"k", "ğ"}, {"k", "g"})
+BUFFER_LETTERS = "yns"
+
+HARMONY = "harmony"
+SOFTENING = "softening"
+VOICING = "voicing"
+BUFFER = "buffer"
+DIACRITICS = "diacritics"
+TYPO = "typo"
+WRONG = "wrong"
+
+HINTS = {
+    HARMONY: "Check vowel harmony: the suffix vowel follows the last vowel of the root.",
+    SOFTENING: "Check consonant softening: a final p, ç, t, k becomes b, c, d, ğ before a vowel.",
+    VOICING: "Check consonant assimilation: d becomes t after ç, f, h, k, p, s, ş, t.",
+    BUFFER: "Check the buffer letter (y, n or s) that keeps two vowels apart.",
+    DIACRITICS: "Use the Turkish letters ç, ş, ğ, ı, ö, ü.",
+    TYPO: "Almost: check the spelling.",
+    WRONG: "",
+}
+
+Grade = namedtuple("Grade", ["correct", "error", "hint", "distance"])
+
+
+def turkish_casefold(text):
+    return text.translate(CASEFOLD).lower()
+
+
+def normalize(text, tolerant=False):
+    text = turkish_casefold(text.strip())
+    return text.translate(ASCII_FOLD) if tolerant else text
+
+
+def bounded_distance(a, b, k):
+    """Levenshtein distance between `a` and `b`, or k + 1 once it exceeds `k`."""
+    if abs(len(a) - len(b)) > k:
+        return k + 1
+    if not a:
+        return len(b)
+    m = len(a)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    peq = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    pv, mv, score = full, 0, m
+    remaining = len(b)
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        remaining -= 1
+        # Each remaining column can lower the score by at most one
+        if score - remaining > k:
+            return k + 1
+    return score if score <= k else k + 1
+
+
+def diagnose(answer, correct, root=""):
+    """Classify a wrong (normalized) answer; returns (error, distance)."""
+    if len(answer) == len(correct):
+        diffs = [(i, a, c) for i, (a, c) in enumerate(zip(answer, correct)) if a != c]
+        # Only a plain letter typed for a Turkish one; ı for i or u for ü the other way round is harmony
+        if all(a == c.translate(ASCII_FOLD) for _, a, c in diffs):
+            return DIACRITICS, len(diffs)
+        # The suffix starts at the end of the root, or one earlier when a final vowel drops
+        if all(a in VOWELS and c in VOWELS and i >= len(root) - 1 for i, a, c in diffs):
+            return HARMONY, len(diffs)
+        if len(diffs) == 1:
+            i, a, c = diffs[0]
+            if {a, c} in SOFT_PAIRS and i == len(root) - 1:
+                return SOFTENING, 1
+            if {a, c} == {"d", "t"} and i >= len(root):
+                return VOICING, 1
+    elif abs(len(answer) - len(correct)) == 1:
+        longer, shorter = (answer, correct) if len(answer) > len(correct) else (correct, answer)
+        for i, c in enumerate(longer):
+            if c in BUFFER_LETTERS and longer[:i] + longer[i + 1:] == shorter:
+                return BUFFER, 1
+
+    distance = bounded_distance(answer, correct, 2)
+    return (TYPO if distance <= 2 else WRONG), distance
+
+
+def grade(answer, correct, root="", tolerant=False, max_typos=0):
+    """Grade `answer` against `correct`.
+
+    `tolerant` accepts c/s/g/i/o/u for ç/ş/ğ/ı/ö/ü; `max_typos` accepts
+    answers within that many edits when the mistake is not a grammar error.
+    """
+    answer, correct, root = normalize(answer, tolerant), normalize(correct, tolerant), normalize(root, tolerant)
+    if answer == correct:
+        return Grade(True, None, "", 0)
+    error, distance = diagnose(answer, correct, root)
+    if error == TYPO and distance <= max_typos:
+        return Grade(True, TYPO, HINTS[TYPO], distance)
+    return Grade(False, error, HINTS[error], distance)
@@ -0,0 +1,259 @@
+"""Handler latency, answer counters and gauges in the Prometheus text format.
+
+Counters and histograms are a dict lookup and an add under a lock, and a
+histogram observation is one bisect over its bucket bounds, so the `timed`
+decorator costs a couple of microseconds per call. Gauges are read from
+callbacks only when metrics are scraped.
+
+`serve()` exposes them over HTTP on a local port, in a background thread:
+
+    GET /metrics               the Prometheus text format
+    GET /profile?seconds=10    sample every thread's stack for that long and
+                               return collapsed stacks, hottest first (the
+                               input format of flamegraph.pl and speedscope)
+
+The sampling profiler runs only while a /profile request is open, so it
+costs nothing the rest of the time. The web app serves them on
+$QUIZ_METRICS_PORT (default 9464, 0 for none); each process on a host needs
+its own port, and one that is already taken is logged and skipped.
+"""
+
+import asyncio
+import collections
+import functools
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; handlers range from microseconds (cached questions) to seconds (worksheet grading)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PROFILE_INTERVAL = 0.005  # seconds between stack samples
+MAX_PROFILE_SECONDS = 300
+
+log = logging.getLogger(__name__)
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        '%s="%s"' % (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, _labels(self.label_names, labels), value) for labels, value in sorted(values)]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.bounds = tuple(buckets)
+        self._series = {}  # labels → [count per bucket (last is +Inf), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.bounds) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        out = []
+        names = self.label_names + ("le",)
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += count
+                out.append((self.name + "_bucket", _labels(names, labels + (_number(bound),)), cumulative))
+            out.append((self.name + "_sum", _labels(self.label_names, labels), total))
+            out.append((self.name + "_count", _labels(self.label_names, labels), cumulative))
+        return out
+
+
+class Gauge:
+    """A value read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, function=None):
+        self.name = name
+        self.help = help
+        self.function = function
+
+    def set_function(self, function):
+        self.function = function
+
+    def samples(self):
+        if self.function is None:
+            return []
+        try:
+            return [(self.name, "", self.function())]
+        except Exception:
+            log.exception("reading gauge %s", self.name)
+            return []
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def exposition(self):
+        lines = []
+        for metric in self.metrics.values():
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {_number(value)}" for name, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+HANDLER_SECONDS = REGISTRY.register(Histogram(
+    "quiz_handler_seconds", "Time spent in each request handler.", ["handler"]))
+HANDLER_ERRORS = REGISTRY.register(Counter(
+    "quiz_handler_errors_total", "Handler calls that raised.", ["handler"]))
+QUESTIONS = REGISTRY.register(Counter(
+    "quiz_questions_total", "Questions handed out.", ["suffix_type"]))
+ANSWERS = REGISTRY.register(Counter(
+    "quiz_answers_total", "Answers recorded, and questions skipped.", ["suffix_type", "outcome"]))
+ACTIVE_SESSIONS = REGISTRY.register(Gauge(
+    "quiz_active_sessions", "Sessions held in this process."))
+EVENT_LOG_BACKLOG = REGISTRY.register(Gauge(
+    "quiz_event_log_backlog", "Events waiting to be written to the event log."))
+
+
+def timed(handler):
+    """Decorator recording the latency of each call to a sync or async function."""
+
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception:
+                    HANDLER_ERRORS.inc(handler)
+                    raise
+                finally:
+                    HANDLER_SECONDS.observe(time.perf_counter() - start, handler)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception:
+                    HANDLER_ERRORS.inc(handler)
+                    raise
+                finally:
+                    HANDLER_SECONDS.observe(time.perf_counter() - start, handler)
+        return wrapper
+
+    return decorate
+
+
+def sample_stacks(seconds, interval=PROFILE_INTERVAL):
+    """Collapsed stacks of every other thread, sampled for `seconds`, as [(stack, count)] hottest first."""
+    me = threading.get_ident()
+    counts = collections.Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts.most_common()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            self._send(200, self.registry.exposition(), CONTENT_TYPE)
+        elif url.path == "/profile":
+            try:
+                seconds = float(parse_qs(url.query).get("seconds", ["10"])[0])
+            except ValueError:
+                seconds = -1
+            if not 0 < seconds <= MAX_PROFILE_SECONDS:
+                self._send(400, f"seconds must be between 0 and {MAX_PROFILE_SECONDS}\n")
+                return
+            stacks = sample_stacks(seconds)
+            self._send(200, "".join(f"{stack} {count}\n" for stack, count in stacks))
+        else:
+            self._send(404, "not found\n")
+
+    def _send(self, status, text, content_type="text/plain; charset=utf-8"):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host=METRICS_HOST, port=METRICS_PORT):
+    """Serve /metrics and /profile from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,96 @@
+"""Mixed quizzes over every category, shuffled lazily.
+
+Instead of flattening every category into one list and shuffling it, a
+mixed quiz walks a seeded pseudo-random permutation of 0..n-1, where n is
+the number of entries in all categories together. The permutation is a
+small Feistel network over the next even power of two at or above n, with
+cycle-walking to stay below n, so position i of the shuffled order is
+computed on its own in a few integer operations and no list is built. A
+shuffled index is turned into (category, item) by bisecting the cumulative
+category sizes.
+
+A session's place in its mixed quiz is just (seed, position): constant
+memory however large the lexicon, and enough to resume it anywhere.
+"""
+
+import random
+from bisect import bisect_right
+
+MIXED_CATEGORY = "Mixed"
+ROUNDS = 4
+MASK32 = 0xFFFFFFFF
+
+
+def _round(value, key):
+    # The murmur3 finaliser, keyed: cheap and mixes every input bit
+    h = ((value ^ key) * 0x9E3779B1) & MASK32
+    h ^= h >> 15
+    h = (h * 0x85EBCA6B) & MASK32
+    return h ^ (h >> 13)
+
+
+class FeistelPermutation:
+    """A seeded permutation of range(n), computed one position at a time."""
+
+    def __init__(self, n, seed, rounds=ROUNDS):
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = (1 << self.half) - 1
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(32) for _ in range(rounds)]
+
+    def _encrypt(self, x):
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (_round(right, key) & self.mask)
+        return (left << self.half) | right
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, position):
+        if not 0 <= position < self.n:
+            raise IndexError("position out of range")
+        # The domain is under 4n, so this takes fewer than four steps on average
+        x = self._encrypt(position)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+
+class MixedQuiz:
+    """Every entry of `lexicon` once, in a shuffled order fixed by `seed`."""
+
+    def __init__(self, lexicon, seed, categories=None):
+        self.lexicon = lexicon
+        self.categories = list(lexicon) if categories is None else list(categories)
+        self.ends = []  # cumulative entry counts: category i holds indexes ends[i-1]..ends[i]-1
+        total = 0
+        for category in self.categories:
+            total += len(lexicon[category])
+            self.ends.append(total)
+        self.seed = seed
+        self.order = FeistelPermutation(total, seed)
+
+    def __len__(self):
+        return len(self.order)
+
+    def locate(self, index):
+        """(category, item) of the entry at `index` in the unshuffled concatenation."""
+        i = bisect_right(self.ends, index)
+        return self.categories[i], index - (self.ends[i - 1] if i else 0)
+
+    def question(self, position):
+        """(category, item, example) asked at `position` of the mixed quiz."""
+        category, item = self.locate(self.order[position])
+        return category, item, self.lexicon[category][item]
+
+    def stream(self, start=0):
+        """(category, item, example) from `start` to the end of the quiz."""
+        for position in range(start, len(self)):
+            yield self.question(position)
+
+
+def new_seed():
+    return random.getrandbits(32)
@@ -0,0 +1,225 @@
+"""Rule-based Turkish suffix generation.
+
+Every root is reduced once to a small tuple of phonological features (harmony
+class of its last vowel, voicing of its final sound, softened stem, ...).
+Each quiz category owns a table indexed by [harmony][final sound] that holds
+the suffix allomorph and its explanation, so inflecting a root is a couple of
+tuple lookups and one string concatenation.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+VOWELS = "aeıioöuü"
+BACK_VOWELS = "aıou"
+VOICELESS = "çfhkpsşt"
+SOFTENING = {"p": "b", "ç": "c", "t": "d", "k": "ğ"}
+
+# Harmony classes of the last vowel
+BACK_UNROUNDED, FRONT_UNROUNDED, BACK_ROUNDED, FRONT_ROUNDED = range(4)
+VOWEL_CLASS = {
+    "a": BACK_UNROUNDED, "ı": BACK_UNROUNDED,
+    "e": FRONT_UNROUNDED, "i": FRONT_UNROUNDED,
+    "o": BACK_ROUNDED, "u": BACK_ROUNDED,
+    "ö": FRONT_ROUNDED, "ü": FRONT_ROUNDED,
+}
+TWO_WAY = ("a", "e", "a", "e")
+FOUR_WAY = ("ı", "i", "u", "ü")
+HARMONY_LABELS = ("a/ı", "e/i", "o/u", "ö/ü")
+# Roots seen by features(): roots.tsv, but also chain stems and the roots of large or synthetic lexicons
+FEATURE_CACHE_SIZE = 65536
+
+# Classes of the final sound of the root
+VOWEL, VOICED, VOICELESS_CONSONANT = range(3)
+
+NOUN, VERB = "noun", "verb"
+
+Features = namedtuple("Features", [
+    "harmony",       # harmony class of the last vowel
+    "final",         # VOWEL, VOICED or VOICELESS_CONSONANT
+    "drop_harmony",  # harmony class once a final vowel is dropped
+    "soft",          # stem with p/ç/t/k softened, or None
+    "syllables",
+])
+
+Rule = namedtuple("Rule", ["pos", "table", "drops_vowel", "softens"])
+
+
+def _back(harmony):
+    return harmony in (BACK_UNROUNDED, BACK_ROUNDED)
+
+
+def _vowel_side(harmony):
+    return "back vowels (a, ı, o, u)" if _back(harmony) else "front vowels (e, i, ö, ü)"
+
+
+def _two_way_table(stem_d, name):
+    # Suffixes such as -da/-de or -dan/-den: two-way harmony, d → t after voiceless
+    table = []
+    for harmony in range(4):
+        vowel = TWO_WAY[harmony]
+        row = []
+        for final in (VOWEL, VOICED, VOICELESS_CONSONANT):
+            suffix = stem_d.format(d="t" if final == VOICELESS_CONSONANT else "d", a=vowel)
+            if final == VOICELESS_CONSONANT:
+                explanation = f"{name} with -{suffix}: d → t after a voiceless consonant, {_vowel_side(harmony)}"
+            else:
+                explanation = f"{name} with -{suffix} after {_vowel_side(harmony)}"
+            row.append((suffix, explanation))
+        table.append(tuple(row))
+    return tuple(table)
+
+
+def _plural_table():
+    return tuple(
+        tuple(
+            (f"l{TWO_WAY[h]}r", f"After {_vowel_side(h)} use '-l{TWO_WAY[h]}r'")
+            for _ in range(3)
+        )
+        for h in range(4)
+    )
+
+
+def _past_table():
+    table = []
+    for harmony in range(4):
+        vowel = FOUR_WAY[harmony]
+        row = []
+        for final in (VOWEL, VOICED, VOICELESS_CONSONANT):
+            if final == VOICELESS_CONSONANT:
+                suffix = "t" + vowel
+                explanation = f"Past tense -{suffix}: d → t after a voiceless consonant, last vowel {HARMONY_LABELS[harmony]}"
+            else:
+                suffix = "d" + vowel
+                explanation = f"Past tense -{suffix} after last vowel {HARMONY_LABELS[harmony]}"
+            row.append((suffix, explanation))
+        table.append(tuple(row))
+    return tuple(table)
+
+
+def _future_table():
+    table = []
+    for harmony in range(4):
+        core = "acak" if _back(harmony) else "ecek"
+        row = (
+            ("y" + core, f"Future form with -y{core}: buffer y after a vowel, {_vowel_side(harmony)}"),
+            (core, f"Future form with -{core} after {_vowel_side(harmony)}"),
+            (core, f"Future form with -{core} after {_vowel_side(harmony)}"),
+        )
+        table.append(row)
+    return tuple(table)
+
+
+def _present_continuous_table():
+    table = []
+    for harmony in range(4):
+        suffix = FOUR_WAY[harmony] + "yor"
+        label = HARMONY_LABELS[harmony]
+        row = (
+            (suffix, f"Final vowel dropped, then -{suffix} after last vowel {label}"),
+            (suffix, f"Present continuous with -{suffix} after last vowel {label}"),
+            (suffix, f"Present continuous with -{suffix} after last vowel {label}"),
+        )
+        table.append(row)
+    return tuple(table)
+
+
+def _conditional_table():
+    return tuple(
+        tuple(
+            ("s" + TWO_WAY[h], f"Conditional form with -s{TWO_WAY[h]} after {_vowel_side(h)}")
+            for _ in range(3)
+        )
+        for h in range(4)
+    )
+
+
+def _possessive_table():
+    table = []
+    for harmony in range(4):
+        suffix = FOUR_WAY[harmony] + "m"
+        row = (
+            ("m", "Possessive 'my' with -m after a vowel"),
+            (suffix, f"Possessive 'my' with -{suffix} after a consonant, last vowel {HARMONY_LABELS[harmony]}"),
+            (suffix, f"Possessive 'my' with -{suffix} after a consonant, last vowel {HARMONY_LABELS[harmony]}"),
+        )
+        table.append(row)
+    return tuple(table)
+
+
+# Category name → rule, in the order the quiz dropdowns list them
+RULES = {
+    "Plural": Rule(NOUN, _plural_table(), False, False),
+    "Past Tense": Rule(VERB, _past_table(), False, False),
+    "Future": Rule(VERB, _future_table(), False, True),
+    "Present Continuous": Rule(VERB, _present_continuous_table(), True, True),
+    "Conditional": Rule(VERB, _conditional_table(), False, False),
+    "Locative": Rule(NOUN, _two_way_table("{d}{a}", "Locative case"), False, False),
+    "Ablative": Rule(NOUN, _two_way_table("{d}{a}n", "Ablative case"), False, False),
+    "Possessive": Rule(NOUN, _possessive_table(), False, True),
+}
+CATEGORIES = list(RULES)
+
+# Forms the rules do not predict
+IRREGULAR_FORMS = {
+    ("ye", "Future"): ("yiyecek", "Irregular: e → i before the -yecek future suffix"),
+    ("de", "Future"): ("diyecek", "Irregular: e → i before the -yecek future suffix"),
+}
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def features(root, soften=None, front=False):
+    """Phonological features of `root`.
+
+    `soften` forces (True) or blocks (False) p/ç/t/k softening; by default only
+    polysyllabic roots with a vowel or n before the final stop soften.
+    `front` marks loanwords such as "saat" that take front-vowel suffixes.
+    """
+    vowels = [c for c in root if c in VOWELS]
+    harmony = VOWEL_CLASS[vowels[-1]] if vowels else FRONT_UNROUNDED
+    if front:
+        harmony = FRONT_ROUNDED if harmony in (BACK_ROUNDED, FRONT_ROUNDED) else FRONT_UNROUNDED
+
+    last = root[-1:]
+    if last in VOWELS:
+        final = VOWEL
+    elif last in VOICELESS:
+        final = VOICELESS_CONSONANT
+    else:
+        final = VOICED
+
+    drop_harmony = harmony
+    if final == VOWEL and len(vowels) > 1:
+        drop_harmony = VOWEL_CLASS[vowels[-2]]
+
+    soft = None
+    if last in SOFTENING:
+        if soften is None:
+            before = root[-2:-1]
+            soften = len(vowels) > 1 and (before in VOWELS or before == "n")
+        if soften:
+            if last == "k" and root[-2:-1] == "n":
+                soft = root[:-1] + "g"
+            else:
+                soft = root[:-1] + SOFTENING[last]
+
+    return Features(harmony, final, drop_harmony, soft, len(vowels))
+
+
+def inflect(root, category, feats=None):
+    """Return (form, explanation) for `root` in `category`."""
+    irregular = IRREGULAR_FORMS.get((root, category))
+    if irregular:
+        return irregular
+
+    rule = RULES[category]
+    f = feats or features(root)
+    stem, harmony = root, f.harmony
+    if rule.drops_vowel and f.final == VOWEL:
+        stem, harmony = root[:-1], f.drop_harmony
+
+    suffix, explanation = rule.table[harmony][f.final]
+    if rule.softens and f.soft and f.final != VOWEL:
+        explanation = f"{explanation}; final {root[-1]} → {f.soft[-1]} before a vowel"
+        stem = f.soft
+    return stem + suffix, explanation
@@ -0,0 +1,186 @@
+"""Durable learner progress on SQLite.
+
+The database runs in WAL mode so reads never wait for the writer, and a
+small pool of connections is shared between threads. Answer events are put
+on a queue and written by a background thread in batches, one transaction
+per batch, so grading never waits for the disk. Within a batch only the
+latest score snapshot of each learner is written.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DB_PATH = "progress.db"  # relative to the working directory
+POOL_SIZE = 4
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.5  # seconds a queued event may wait for its batch to fill
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learners (
+    learner_id TEXT PRIMARY KEY,
+    correct_count INTEGER NOT NULL,
+    total_attempts INTEGER NOT NULL,
+    streak INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    question_history TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS answers (
+    learner_id TEXT NOT NULL,
+    answered_at REAL NOT NULL,
+    suffix_type TEXT,
+    item INTEGER,
+    correct INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_by_learner ON answers (learner_id, answered_at);
+"""
+
+
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._pool = queue.LifoQueue()
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self):
+        # Autocommit mode; transactions are opened explicitly with BEGIN
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class BatchWriter:
+    """Background thread that drains a queue and passes batches to `write`."""
+
+    def __init__(self, write, batch_size=BATCH_SIZE, interval=FLUSH_INTERVAL, name="batch-writer"):
+        self.write = write
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, item):
+        self.queue.put(item)
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        self.queue.join()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception:
+                    log.exception("dropping a batch of %d events", len(batch))
+                for _ in batch:
+                    self.queue.task_done()
+
+
+class ProgressStore:
+    def __init__(self, path=DB_PATH, pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+        self.writer = BatchWriter(self._write_batch, name="progress-writer")
+        atexit.register(self.close)
+
+    def record_answer(self, learner_id, snapshot, suffix_type=None, item=None, correct=False):
+        """Queue an answer event with the learner's score snapshot after it."""
+        self.writer.put((learner_id, snapshot, (learner_id, time.time(), suffix_type, item, int(correct))))
+
+    def load(self, learner_id):
+        """Last saved snapshot of `learner_id`, or None for a new learner."""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT correct_count, total_attempts, streak, start_time, question_history"
+                " FROM learners WHERE learner_id = ?", (learner_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "correct_count": row[0],
+            "total_attempts": row[1],
+            "streak": row[2],
+            "start_time": row[3],
+            "question_history": json.loads(row[4]),
+        }
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+        self.pool.close()
+
+    def _write_batch(self, batch):
+        latest = {}
+        answers = []
+        for learner_id, snapshot, answer in batch:
+            latest[learner_id] = snapshot
+            answers.append(answer)
+        now = time.time()
+        learners = [
+            (learner_id, s["correct_count"], s["total_attempts"], s["streak"], s["start_time"],
+             json.dumps(s["question_history"], ensure_ascii=False), now)
+            for learner_id, s in latest.items()
+        ]
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("INSERT INTO answers VALUES (?, ?, ?, ?, ?)", answers)
+                conn.executemany(
+                    "INSERT INTO learners VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (learner_id) DO UPDATE SET"
+                    " correct_count = excluded.correct_count, total_attempts = excluded.total_attempts,"
+                    " streak = excluded.streak, start_time = excluded.start_time,"
+                    " question_history = excluded.question_history, updated_at = excluded.updated_at",
+                    learners,
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
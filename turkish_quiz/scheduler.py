@@ -0,0 +1,187 @@
+"""Leitner-box spaced repetition.
+
+Items never asked yet come first, in a seeded shuffled order walked one
+position at a time (see mixed.FeistelPermutation); after that, items are
+asked from a heap keyed by due time. Either way choosing the next question
+costs O(log n) however large the deck is, and a deck holds, and saves, only
+the items its learner has seen. A correct answer moves the item up one box
+(longer interval), a wrong one sends it back to the first box. Answers to
+items the deck did not hand out (drills, mixed quizzes) count too: the item
+is rescheduled, and its place in the unasked order or its old heap entry is
+skipped when it comes up. Answers to a deck not started yet are kept as
+item → (box, due) until it is, so they never build a deck of their own.
+"""
+
+import heapq
+import random
+import threading
+import time
+
+from .mixed import FeistelPermutation
+
+# Seconds until an item in box i is due again
+BOX_INTERVALS = (15, 60, 10 * 60, 60 * 60, 24 * 60 * 60, 7 * 24 * 60 * 60)
+
+
+def next_box(box, correct, intervals=BOX_INTERVALS):
+    return min(box + 1, len(intervals) - 1) if correct else 0
+
+
+class Deck:
+    def __init__(self, size, intervals=BOX_INTERVALS, seed=None):
+        self.size = size
+        self.intervals = intervals
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.order = FeistelPermutation(size, self.seed)
+        self.position = 0  # items at order[position:] have never been handed out
+        self.heap = []  # (due, tie-break, item), for items handed out or answered at least once
+        self.seq = 0
+        self.boxes = {}  # item → box, only for items answered at least once
+        self.in_flight = set()  # handed out, not answered yet
+        self.current = {}  # item → seq of its live heap entry
+
+    def _push(self, item, due):
+        self.seq += 1
+        self.current[item] = self.seq
+        heapq.heappush(self.heap, (due, self.seq, item))
+
+    def _seen(self, item):
+        return item in self.current or item in self.in_flight
+
+    def take(self, n):
+        items = []
+        while self.position < self.size and len(items) < n:
+            item = self.order[self.position]
+            self.position += 1
+            # Already scheduled by an answer the deck did not hand out
+            if not self._seen(item):
+                items.append(item)
+        while self.heap and len(items) < n:
+            _, seq, item = heapq.heappop(self.heap)
+            # An entry superseded by a later push
+            if self.current.get(item) == seq:
+                del self.current[item]
+                items.append(item)
+        self.in_flight.update(items)
+        return items
+
+    def record(self, item, correct, now):
+        if item in self.in_flight:
+            self.in_flight.discard(item)
+        elif not 0 <= item < self.size:
+            return
+        box = next_box(self.boxes.get(item, 0), correct, self.intervals)
+        self.place(item, box, now + self.intervals[box])
+
+    def place(self, item, box, due):
+        """Put `item` in `box`, due at `due`."""
+        self.boxes[item] = box
+        self._push(item, due)
+
+    def skip(self, item, now):
+        # Handed out but never answered: bring it back soon, keeping its box
+        if item in self.in_flight:
+            self.in_flight.discard(item)
+            self._push(item, now + self.intervals[0])
+
+    def dump(self):
+        """Only what the learner has touched; the unasked order is rebuilt from its seed."""
+        return {
+            "size": self.size,
+            "seed": self.seed,
+            "position": self.position,
+            "seq": self.seq,
+            "scheduled": [[item, due, seq] for due, seq, item in self.heap if self.current.get(item) == seq],
+            "boxes": list(self.boxes.items()),
+            "in_flight": list(self.in_flight),
+        }
+
+    @classmethod
+    def load(cls, data, intervals=BOX_INTERVALS):
+        deck = cls(data["size"], intervals, data["seed"])
+        deck.position = data["position"]
+        deck.seq = data["seq"]
+        deck.heap = [(due, seq, item) for item, due, seq in data["scheduled"]]
+        heapq.heapify(deck.heap)
+        deck.current = {item: seq for item, _, seq in data["scheduled"]}
+        deck.boxes = dict(data["boxes"])
+        deck.in_flight = set(data["in_flight"])
+        return deck
+
+
+class LeitnerScheduler:
+    """One learner's decks, one per suffix category."""
+
+    def __init__(self, intervals=BOX_INTERVALS, clock=time.time):
+        self.intervals = intervals
+        self.clock = clock
+        self.decks = {}
+        self.last = None  # (deck name, item) most recently handed out by next_item
+        self.pending = {}  # deck name → {item: [box, due]}, answers to decks not started yet
+        self.lock = threading.Lock()
+
+    def _deck(self, deck_name, size):
+        deck = self.decks.get(deck_name)
+        if deck is None or deck.size != size:
+            deck = self.decks[deck_name] = Deck(size, self.intervals)
+            for item, (box, due) in self.pending.pop(deck_name, {}).items():
+                if item < size:
+                    deck.place(item, box, due)
+        return deck
+
+    def next_items(self, deck_name, size, n):
+        """Indexes of up to `n` items to ask next from a deck of `size` items."""
+        with self.lock:
+            return self._deck(deck_name, size).take(n)
+
+    def next_item(self, deck_name, size):
+        """Index of the next item; an unanswered previous item is re-queued."""
+        with self.lock:
+            if self.last is not None:
+                last_deck, last_item = self.last
+                self.decks[last_deck].skip(last_item, self.clock())
+            item = self._deck(deck_name, size).take(1)[0]
+            self.last = (deck_name, item)
+            return item
+
+    def record(self, correct, deck_name=None, item=None, size=None):
+        """Reschedule an answered item, by default the one next_item returned last.
+
+        Given the deck's `size`, an answer to a deck not used yet is kept for when it starts.
+        """
+        with self.lock:
+            if deck_name is None:
+                if self.last is None:
+                    return
+                deck_name, item = self.last
+                self.last = None
+            deck = self.decks.get(deck_name)
+            if deck is not None and size in (None, deck.size):
+                deck.record(item, correct, self.clock())
+            elif size is not None and 0 <= item < size:
+                pending = self.pending.setdefault(deck_name, {})
+                box = next_box(pending[item][0] if item in pending else 0, correct, self.intervals)
+                pending[item] = [box, self.clock() + self.intervals[box]]
+
+    def skip(self, deck_name, item):
+        with self.lock:
+            deck = self.decks.get(deck_name)
+            if deck is not None:
+                deck.skip(item, self.clock())
+
+    def dump(self):
+        """JSON-ready state of every deck, for load() in this or another process."""
+        with self.lock:
+            return {
+                "last": self.last,
+                "decks": {name: deck.dump() for name, deck in self.decks.items()},
+                "pending": {name: [[item, *entry] for item, entry in answers.items()]
+                            for name, answers in self.pending.items()},
+            }
+
+    def load(self, data):
+        with self.lock:
+            self.last = tuple(data["last"]) if data["last"] else None
+            self.decks = {name: Deck.load(deck, self.intervals) for name, deck in data["decks"].items()}
+            self.pending = {name: {item: [box, due] for item, box, due in answers}
+                            for name, answers in data.get("pending", {}).items()}
@@ -0,0 +1,206 @@
+"""Quiz logic shared by the web app and the JSON API.
+
+QuizService owns the lexicon, per-session state, the event log and the error
+statistics, and does not care how requests reach it. Questions are
+[suffix type, item, root, translation, answer, explanation] and progress
+events are [suffix type, item, 1/0, or None when the question was skipped].
+Progress comes from clients, so it is checked here for every front end.
+Questions of the "Mixed" category come from every category of the lexicon
+and carry their own suffix type, so answers to them are recorded as usual.
+When $QUIZ_STATE_URL names a shared backend, sessions are kept there and
+saved after every change, so several processes can serve the same learners.
+A session attached to a named learner also saves that learner's progress to
+the ProgressStore, which outlives restarts.
+"""
+
+import random
+
+from . import metrics
+from .analytics import ErrorStats
+from .chains import CHAIN_CATEGORY, ChainExamples
+from .compiled_lexicon import open_lexicon
+from .event_log import EventLog
+from .feature_index import FeatureIndex
+from .matcher import grade
+from .mixed import MIXED_CATEGORY, MixedQuiz
+from .progress_store import ProgressStore
+from .session_state import SessionStore
+from .state_backend import open_backend
+
+PROGRESS_ERROR = "progress must be a list of [category, item, 1/0/null] for questions that exist"
+
+
+class QuizService:
+    def __init__(self, lexicon=None, sessions=None, events=None, error_stats=None, progress=None):
+        self.lexicon = open_lexicon() if lexicon is None else lexicon
+        self.chains = ChainExamples()
+        if sessions is None:
+            sessions = SessionStore(progress=ProgressStore() if progress is None else progress,
+                                    backend=open_backend())
+        self.sessions = sessions
+        self.events = EventLog() if events is None else events
+        self.error_stats = ErrorStats() if error_stats is None else error_stats
+        self.features = FeatureIndex(self.lexicon)
+        metrics.ACTIVE_SESSIONS.set_function(lambda: len(self.sessions))
+        metrics.EVENT_LOG_BACKLOG.set_function(lambda: self.events.writer.queue.qsize())
+
+    def close(self):
+        """Write out queued events and progress."""
+        self.events.close()
+        if self.sessions.progress is not None:
+            self.sessions.progress.close()
+
+    def categories(self):
+        return list(self.lexicon) + [MIXED_CATEGORY, CHAIN_CATEGORY]
+
+    def examples_for(self, suffix_type):
+        if suffix_type == CHAIN_CATEGORY:
+            return self.chains
+        return self.lexicon.get(suffix_type, [])
+
+    def attach_learner(self, session_id, name):
+        """Carry on the saved progress of the learner called `name` in this session; returns its stats."""
+        self.sessions.attach_learner(session_id, name.strip().lower())
+        return self.stats(session_id)
+
+    def is_question(self, suffix_type, item):
+        """Whether (suffix_type, item), as sent back by a client, names a question."""
+        if not isinstance(suffix_type, str) or (suffix_type != CHAIN_CATEGORY and suffix_type not in self.lexicon):
+            return False
+        return isinstance(item, int) and not isinstance(item, bool) and 0 <= item < len(self.examples_for(suffix_type))
+
+    def _is_event(self, event):
+        return (isinstance(event, (list, tuple)) and len(event) == 3 and event[2] in (0, 1, None)
+                and self.is_question(event[0], event[1]))
+
+    def progress_error(self, progress):
+        """Why `progress` cannot be applied, or None when every event is well-formed."""
+        if not isinstance(progress, list) or not all(self._is_event(event) for event in progress):
+            return PROGRESS_ERROR
+        return None
+
+    def mixed_quiz(self, seed):
+        return MixedQuiz(self.lexicon, seed)
+
+    def mixed_cursor(self, session_id):
+        """[seed, position] of the session's mixed quiz, or None if it has not started one."""
+        quiz_state = self.sessions.get(session_id)
+        with quiz_state.lock:
+            return quiz_state.mixed and list(quiz_state.mixed)
+
+    def resume_mixed(self, session_id, cursor):
+        """Carry on the mixed quiz at `cursor`, as returned by mixed_cursor, possibly in another session."""
+        quiz_state = self.sessions.get(session_id)
+        with quiz_state.lock:
+            quiz_state.mixed = [int(cursor[0]), int(cursor[1])]
+        self.sessions.save(session_id, quiz_state)
+
+    def question_batch(self, session_id, suffix_type, n, adaptive=False, drill=None):
+        """Up to `n` questions; `drill` ({dimension: value}, see feature_index) narrows them down."""
+        quiz_state = self.sessions.get(session_id)
+        if suffix_type == MIXED_CATEGORY:
+            # Every category at once, in the session's lazily shuffled order; drills do not apply
+            picked = quiz_state.next_mixed(self.mixed_quiz, n)
+        elif suffix_type == CHAIN_CATEGORY:
+            # Chains are drawn from a random stream rather than a Leitner deck over every chain
+            picked = quiz_state.next_from_stream(suffix_type, self.chains.stream, n)
+        elif drill and suffix_type in self.lexicon:
+            # Drills draw at random from the matching items; answers still update the decks (see _record)
+            examples = self.examples_for(suffix_type)
+            ids = self.features.query(suffix_type, drill)
+            picked = [(item, examples[item]) for item in random.sample(ids, min(n, len(ids)))]
+        else:
+            picked = quiz_state.next_examples(suffix_type, self.examples_for(suffix_type), n, adaptive)
+        if suffix_type != MIXED_CATEGORY:
+            picked = [(suffix_type, item, example) for item, example in picked]
+        self.sessions.save(session_id, quiz_state)
+        batch = [
+            [category, item, example[0], example[3], example[1], example[2]]
+            for category, item, example in picked
+        ]
+        for question in batch:
+            metrics.QUESTIONS.inc(question[0])
+            self.events.log("question", session=session_id, suffix_type=question[0], item=question[1],
+                            root=question[2])
+        return batch
+
+    @property
+    def blocking(self):
+        """Whether sessions live in a shared backend, so that using them waits on SQLite or a socket."""
+        return self.sessions.backend is not None
+
+    def skip(self, session_id, suffix_type, item):
+        """Put a question the learner will not answer back into its deck."""
+        self.skip_many(session_id, [(suffix_type, item)])
+
+    def skip_many(self, session_id, questions):
+        """skip() for several (suffix type, item) pairs, loading and saving the session once.
+
+        Pairs that name no question are ignored.
+        """
+        questions = [q for q in questions if isinstance(q, (list, tuple)) and len(q) == 2 and self.is_question(*q)]
+        if not questions:
+            return
+        quiz_state = self.sessions.get(session_id)
+        for suffix_type, item in questions:
+            quiz_state.skip(suffix_type, item)
+            metrics.ANSWERS.inc(suffix_type, "skipped")
+        self.sessions.save(session_id, quiz_state)
+
+    def record_answer(self, session_id, suffix_type, item, correct, root, rule, answer=None):
+        quiz_state = self.sessions.get(session_id)
+        self._record(session_id, quiz_state, suffix_type, item, correct, root, rule, answer)
+        self.sessions.save(session_id, quiz_state)
+
+    def apply_progress(self, session_id, progress, strict=True):
+        """Record the answers and skips a client graded itself; returns how many events it consumed.
+
+        Malformed events (see progress_error) raise ValueError before any is applied, or with
+        `strict` off are dropped, so a stale or tampered batch cannot wedge a client.
+        """
+        consumed = len(progress) if isinstance(progress, list) else 0
+        if self.progress_error(progress) is not None:
+            if strict:
+                raise ValueError(PROGRESS_ERROR)
+            progress = [event for event in progress if self._is_event(event)] if consumed else []
+        if not progress:
+            return consumed
+        quiz_state = self.sessions.get(session_id)
+        for suffix_type, item, outcome in progress:
+            root, _, rule, _ = self.examples_for(suffix_type)[item]
+            if outcome is None:
+                quiz_state.skip(suffix_type, item)
+                metrics.ANSWERS.inc(suffix_type, "skipped")
+                self.events.log("skip", session=session_id, suffix_type=suffix_type, item=item, root=root)
+            else:
+                self._record(session_id, quiz_state, suffix_type, item, bool(outcome), root, rule)
+        self.sessions.save(session_id, quiz_state)
+        return consumed
+
+    def _record(self, session_id, quiz_state, suffix_type, item, correct, root, rule, answer=None):
+        # Drill and mixed questions never came from the decks; the size lets the answer count for one
+        # not started yet, which keeps it aside without building the deck
+        size = len(self.lexicon[suffix_type]) if suffix_type in self.lexicon else None
+        quiz_state.record_answer(correct, suffix_type, item, size)
+        self.error_stats.record(suffix_type, rule, root, correct)
+        metrics.ANSWERS.inc(suffix_type, "correct" if correct else "wrong")
+        self.events.log("answer", session=session_id, suffix_type=suffix_type, item=item, root=root,
+                        answer=answer, correct=correct)
+
+    def grade(self, session_id, suffix_type, item, answer, tolerant=False):
+        """Grade and record an answer to question `item`; returns (Grade, example)."""
+        example = self.examples_for(suffix_type)[item]
+        root, form, rule, _ = example
+        outcome = grade(answer, form, root, tolerant)
+        self.record_answer(session_id, suffix_type, item, outcome.correct, root, rule, answer)
+        return outcome, example
+
+    def stats(self, session_id):
+        quiz_state = self.sessions.get(session_id)
+        with quiz_state.lock:
+            return {
+                "correct_count": quiz_state.correct_count,
+                "total_attempts": quiz_state.total_attempts,
+                "streak": quiz_state.streak,
+                "start_time": quiz_state.start_time.isoformat(),
+            }
@@ -0,0 +1,220 @@
+"""Per-session quiz state.
+
+Each browser session gets its own QuizState, looked up by the Gradio session
+hash. Sessions are kept in least-recently-used order so idle ones can be
+evicted from the front in amortised constant time, and question history is
+a fixed-size ring buffer, so memory stays flat as users come and go.
+A session that names its learner is saved to a ProgressStore after every
+answer and picks up that learner's saved progress when it is attached.
+With a shared backend (see state_backend) sessions are saved there too, so
+other processes can carry on with them. A mixed quiz is kept as just its
+(seed, position) cursor (see mixed).
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from itertools import islice
+
+from .bandit import ThompsonScheduler
+from .mixed import new_seed
+from .scheduler import LeitnerScheduler
+
+HISTORY_SIZE = 50
+SESSION_TTL = 30 * 60  # seconds a session may stay idle before it is dropped
+MAX_SESSIONS = 10_000
+SESSION_KEY = "tsq:session:"  # key prefix in a shared backend
+
+
+class QuizState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.learner_id = None
+        self.progress = None
+        self.reset()
+
+    def reset(self):
+        self.streak = 0
+        self.correct_count = 0
+        self.total_attempts = 0
+        self.start_time = datetime.now()
+        self.question_history = deque(maxlen=HISTORY_SIZE)
+        self.scheduler = LeitnerScheduler()
+        self.bandit = ThompsonScheduler()
+        self.streams = {}
+        self.mixed = None  # [seed, position] of the mixed quiz, once one is started
+
+    def next_example(self, suffix_type, examples):
+        example = examples[self.scheduler.next_item(suffix_type, len(examples))]
+        self.question_history.append(example)
+        return example
+
+    def next_examples(self, suffix_type, examples, n, adaptive=False):
+        """Prefetch up to `n` (item index, example) pairs for the browser to work through.
+
+        `adaptive` picks them by Thompson sampling instead of from the Leitner deck.
+        """
+        scheduler = self.bandit if adaptive else self.scheduler
+        items = scheduler.next_items(suffix_type, len(examples), n)
+        batch = [(item, examples[item]) for item in items]
+        self.question_history.extend(example for _, example in batch)
+        return batch
+
+    def next_from_stream(self, name, make_stream, n):
+        """Take up to `n` (item index, example) pairs from this session's `name` stream."""
+        with self.lock:
+            stream = self.streams.get(name)
+            if stream is None:
+                stream = self.streams[name] = make_stream()
+            batch = list(islice(stream, n))
+        self.question_history.extend(example for _, example in batch)
+        return batch
+
+    def next_mixed(self, make_quiz, n):
+        """Take up to `n` (category, item index, example) triples from this session's mixed quiz.
+
+        `make_quiz(seed)` builds the MixedQuiz; once one is finished the next starts in a new order.
+        """
+        with self.lock:
+            if self.mixed is None:
+                self.mixed = [new_seed(), 0]
+            quiz = make_quiz(self.mixed[0])
+            if self.mixed[1] >= len(quiz):
+                self.mixed = [new_seed(), 0]
+                quiz = make_quiz(self.mixed[0])
+            start = self.mixed[1]
+            self.mixed[1] = min(start + n, len(quiz))
+            batch = [quiz.question(position) for position in range(start, self.mixed[1])]
+        self.question_history.extend(example for _, _, example in batch)
+        return batch
+
+    def record_answer(self, correct, suffix_type=None, item=None, size=None):
+        """Count an answer and reschedule its item; with `size` it counts for a deck not started yet too."""
+        with self.lock:
+            self.total_attempts += 1
+            if correct:
+                self.correct_count += 1
+                self.streak += 1
+            else:
+                self.streak = 0
+            snapshot = self.snapshot() if self.progress is not None else None
+        if snapshot is not None:
+            self.progress.record_answer(self.learner_id, snapshot, suffix_type, item, correct)
+        self.scheduler.record(correct, suffix_type, item, size)
+        self.bandit.record(correct, suffix_type, item, size)
+
+    def skip(self, suffix_type, item):
+        self.scheduler.skip(suffix_type, item)
+        self.bandit.skip(suffix_type, item)
+
+    def snapshot(self):
+        return {
+            "correct_count": self.correct_count,
+            "total_attempts": self.total_attempts,
+            "streak": self.streak,
+            "start_time": self.start_time.isoformat(),
+            "question_history": list(self.question_history),
+        }
+
+    def restore(self, snapshot):
+        with self.lock:
+            self.correct_count = snapshot["correct_count"]
+            self.total_attempts = snapshot["total_attempts"]
+            self.streak = snapshot["streak"]
+            self.start_time = datetime.fromisoformat(snapshot["start_time"])
+            self.question_history.clear()
+            self.question_history.extend(tuple(example) for example in snapshot["question_history"])
+
+    def session_snapshot(self):
+        """Everything about the session, including its decks, as JSON-ready data."""
+        with self.lock:
+            snapshot = self.snapshot()
+            snapshot["learner_id"] = self.learner_id
+            snapshot["mixed"] = self.mixed and list(self.mixed)
+        snapshot["scheduler"] = self.scheduler.dump()
+        snapshot["bandit"] = self.bandit.dump()
+        return snapshot
+
+    def restore_session(self, snapshot, progress=None):
+        self.restore(snapshot)
+        self.scheduler.load(snapshot["scheduler"])
+        self.bandit.load(snapshot["bandit"])
+        self.mixed = snapshot.get("mixed")
+        self.learner_id = snapshot["learner_id"]
+        self.progress = progress if self.learner_id is not None else None
+
+
+class SessionStore:
+    """Thread-safe session id → state map with idle eviction."""
+
+    def __init__(self, factory=QuizState, ttl=SESSION_TTL, max_sessions=MAX_SESSIONS, progress=None, backend=None):
+        self.factory = factory
+        self.progress = progress
+        self.backend = backend
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session id → [last seen, state, snapshot as last stored]
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        stored = None if self.backend is None else self.backend.get(SESSION_KEY + session_id)
+        now = time.monotonic()
+        with self._lock:
+            slot = self._sessions.get(session_id)
+            if slot is None:
+                slot = self._sessions[session_id] = [now, self.factory(), None]
+            else:
+                slot[0] = now
+                self._sessions.move_to_end(session_id)
+            if stored != slot[2]:
+                # Another process has moved this session on since we last saw it
+                state = slot[1] = self.factory()
+                if stored is not None:
+                    state.restore_session(json.loads(stored), self.progress)
+                slot[2] = stored
+            self._evict(now)
+            return slot[1]
+
+    def save(self, session_id, state):
+        """Store the session in the shared backend, if there is one."""
+        if self.backend is None:
+            return
+        stored = json.dumps(state.session_snapshot(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.backend.set(SESSION_KEY + session_id, stored, self.ttl)
+        with self._lock:
+            slot = self._sessions.get(session_id)
+            if slot is not None and slot[1] is state:
+                slot[2] = stored
+
+    def attach_learner(self, session_id, learner_id):
+        """Tie a session to `learner_id`, restoring that learner's saved progress."""
+        state = self.get(session_id)
+        if self.progress is None or state.learner_id == learner_id:
+            return state
+        snapshot = self.progress.load(learner_id)
+        state.reset()
+        if snapshot is not None:
+            state.restore(snapshot)
+        state.learner_id = learner_id
+        state.progress = self.progress
+        self.save(session_id, state)
+        return state
+
+    def discard(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        if self.backend is not None:
+            self.backend.delete(SESSION_KEY + session_id)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _evict(self, now):
+        sessions = self._sessions
+        while sessions:
+            session_id, (last_seen, _, _) = next(iter(sessions.items()))
+            if now - last_seen < self.ttl and len(sessions) <= self.max_sessions:
+                break
+            del sessions[session_id]
@@ -0,0 +1,330 @@
+"""Shared session state, so several app processes can serve the same learners.
+
+A SessionStore given a backend keeps each session as a JSON snapshot in it
+(scores, history, Leitner decks, adaptive posteriors) and reloads it
+whenever another process has changed it, so any worker can take a
+learner's next request. Each process still caches the sessions it has seen
+and skips the parse when the stored snapshot is the one it last saw.
+Requests for one session are expected one at a time; if two workers do get
+the same session at once, the last write wins.
+
+    memory:                          one process (the default without a backend)
+    sqlite:///state.db               processes on one machine sharing a file
+    redis://[:password@]host:6379/0  processes on any number of machines
+
+The backend is chosen by the QUIZ_STATE_URL environment variable, e.g.
+
+    QUIZ_STATE_URL=sqlite:///state.db turkish-quiz-api --workers 4
+
+The Redis backend speaks RESP itself, so it needs no client library, and
+`python -m turkish_quiz.state_backend serve` runs a small in-memory server
+speaking the same protocol, to test against without a Redis install.
+"""
+
+import argparse
+import asyncio
+import os
+import queue
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from itertools import count
+from urllib.parse import unquote, urlparse
+
+from .progress_store import ConnectionPool
+
+STATE_URL_ENV = "QUIZ_STATE_URL"
+POOL_SIZE = 4
+PRUNE_EVERY = 1000  # SQLite writes between sweeps of expired keys
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL
+);
+"""
+
+
+class MemoryBackend:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._data = {}  # key → (value, expiry time or None)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= self.clock():
+                del self._data[key]
+                return None
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, None if ttl is None else self.clock() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            return 0 if self._data.pop(key, None) is None else 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend:
+    def __init__(self, path, pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+        self._writes = count(1)  # next() on it is atomic, so threads sharing the backend need no lock
+
+    def get(self, key):
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM state WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, time.time())
+            ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self.pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO state VALUES (?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                (key, value, None if ttl is None else now + ttl),
+            )
+            if next(self._writes) % PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM state WHERE expires <= ?", (now,))
+
+    def delete(self, key):
+        with self.pool.connection() as conn:
+            return conn.execute("DELETE FROM state WHERE key = ?", (key,)).rowcount
+
+    def close(self):
+        self.pool.close()
+
+
+class RedisError(Exception):
+    pass
+
+
+def _encode(args):
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif isinstance(arg, int):
+            arg = b"%d" % arg
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def _read_reply(f):
+    line = f.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("connection closed by the server")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RedisError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        if size < 0:
+            return None
+        data = f.read(size + 2)
+        if len(data) != size + 2:
+            raise ConnectionError("connection closed by the server")
+        return data[:-2]
+    if kind == b"*":
+        size = int(rest)
+        return None if size < 0 else [_read_reply(f) for _ in range(size)]
+    raise RedisError(f"unexpected reply {line!r}")
+
+
+class RedisBackend:
+    """Just enough of a Redis client: GET, SET with EX, DEL, over pooled connections."""
+
+    def __init__(self, host="127.0.0.1", port=6379, db=0, password=None, pool_size=POOL_SIZE, timeout=5.0):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(pool_size)
+
+    def _connect(self):
+        sock = socket.create_connection(self.address, self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile("rb"))
+        try:
+            if self.password:
+                self._call(conn, ("AUTH", self.password))
+            if self.db:
+                self._call(conn, ("SELECT", self.db))
+        except BaseException:
+            sock.close()
+            raise
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except BaseException:
+            # The reply stream may be out of step now; never reuse the connection
+            conn[0].close()
+            raise
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn[0].close()
+
+    def _call(self, conn, args):
+        sock, f = conn
+        sock.sendall(_encode(args))
+        reply = _read_reply(f)
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def execute(self, *args):
+        with self._connection() as conn:
+            return self._call(conn, args)
+
+    def get(self, key):
+        return self.execute("GET", key)
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            self.execute("SET", key, value)
+        else:
+            self.execute("SET", key, value, "EX", max(1, int(ttl)))
+
+    def delete(self, key):
+        return self.execute("DEL", key)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait()[0].close()
+
+
+def open_backend(url=None):
+    """Backend for `url`, by default $QUIZ_STATE_URL; None when neither is set."""
+    url = url or os.environ.get(STATE_URL_ENV)
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryBackend()
+    if parsed.scheme == "sqlite":
+        # sqlite:///relative.db, sqlite:////absolute/path.db
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if parsed.scheme == "redis":
+        db = parsed.path.strip("/")
+        return RedisBackend(parsed.hostname or "127.0.0.1", parsed.port or 6379, int(db) if db else 0,
+                            unquote(parsed.password) if parsed.password else None)
+    raise ValueError(f"unknown state backend {url!r}; use memory:, sqlite:///path or redis://host:port/db")
+
+
+# The local stand-in: a RESP server over a MemoryBackend, one database, no persistence
+
+def _reply(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return b"-ERR %s\r\n" % str(value).encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _dispatch(store, args):
+    command = args[0].upper() if args else b""
+    if command == b"PING":
+        return args[1] if len(args) > 1 else "PONG"
+    if command == b"GET" and len(args) == 2:
+        return store.get(args[1])
+    if command == b"SET" and len(args) in (3, 5):
+        ttl = None
+        if len(args) == 5:
+            unit = args[3].upper()
+            if unit not in (b"EX", b"PX"):
+                return ValueError("syntax error")
+            ttl = int(args[4]) / (1000 if unit == b"PX" else 1)
+        store.set(args[1], args[2], ttl)
+        return "OK"
+    if command == b"DEL" and len(args) >= 2:
+        return sum(store.delete(key) for key in args[1:])
+    if command == b"FLUSHDB":
+        store.clear()
+        return "OK"
+    if command in (b"SELECT", b"AUTH"):
+        return "OK"
+    return ValueError(f"unknown command or wrong arguments for {command.decode(errors='replace')!r}")
+
+
+async def _read_command(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split()  # inline command, as typed into telnet
+    args = []
+    for _ in range(int(line[1:])):
+        size = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(size + 2))[:-2])
+    return args
+
+
+async def _serve_client(reader, writer, store):
+    try:
+        while True:
+            args = await _read_command(reader)
+            if args is None:
+                break
+            writer.write(_reply(_dispatch(store, args)))
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=6379):
+    store = MemoryBackend()
+    server = await asyncio.start_server(lambda r, w: _serve_client(r, w, store), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run an in-memory server speaking the Redis protocol")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
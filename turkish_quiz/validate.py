@@ -0,0 +1,182 @@
+"""Check lexicon entries against the grammar rules.
+
+Every (root, category, form, explanation) entry is re-derived with the
+morphology engine and checked for:
+
+    category     the category is not one the engine knows
+    pos          the root is listed in roots.tsv with another part of speech
+    form         the form is not the one the rules produce for the root
+    explanation  the explanation names no suffix the form ends with, or a
+                 stem change (k → ğ, e → i) the form does not show
+
+Results are cached by a hash of the entry, the root's features and the
+engine source, so a rerun only checks new or changed entries. Large sets of
+unchecked entries are spread over worker processes. The exit status is 1
+when any entry has an issue, so it can gate a data change.
+
+    python -m turkish_quiz.validate                  # the lexicon built from roots.tsv
+    python -m turkish_quiz.validate import.tsv       # root, category, form, explanation rows
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from . import morphology
+from .lexicon import build_suffix_examples, load_roots
+from .morphology import NOUN, RULES, features, inflect
+
+CACHE_PATH = ".validate_cache.json"
+PARALLEL_MIN = 20_000  # unchecked entries before worker processes are worth starting
+CHUNK = 5_000
+
+SUFFIX = re.compile(r"-([a-zçğıöşü]+)")
+CHANGE = re.compile(r"\b([a-zçğıöşü]) → ([a-zçğıöşü])\b")
+SUFFIX_CHANGES = {("d", "t")}  # alternations inside the suffix, which the suffix check covers
+
+_roots = None  # root → Root from roots.tsv, one copy per worker process
+
+
+def _engine_fingerprint():
+    with open(morphology.__file__, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def root_features(root, category, roots):
+    known = roots.get(root)
+    if known is not None and known.pos == RULES[category].pos:
+        return known.features
+    return features(root, None if RULES[category].pos == NOUN else False)
+
+
+def check_entry(root, category, form, explanation, roots):
+    """Issues with one entry, as (code, message) pairs."""
+    if category not in RULES:
+        return [("category", f"unknown category {category!r}")]
+    issues = []
+    known = roots.get(root)
+    if known is not None and known.pos != RULES[category].pos:
+        issues.append(("pos", f"{root} is a {known.pos}, but {category} takes a {RULES[category].pos}"))
+
+    expected, _ = inflect(root, category, root_features(root, category, roots))
+    if form != expected:
+        issues.append(("form", f"expected {expected}, not {form}"))
+
+    suffixes = SUFFIX.findall(explanation)
+    if not any(form.endswith(suffix) for suffix in suffixes):
+        named = ", ".join(f"-{s}" for s in suffixes) or "no suffix"
+        issues.append(("explanation", f"explanation names {named}, but the form is {form}"))
+    for before, after in CHANGE.findall(explanation):
+        if (before, after) in SUFFIX_CHANGES:
+            continue
+        # A stem change: some `before` in the root must be `after` at the same place in the form
+        if not any(c == before and form[i:i + 1] == after for i, c in enumerate(root)):
+            issues.append(("explanation", f"explanation says {before} → {after}, which {form} does not show"))
+    return issues
+
+
+def entry_hash(entry, roots, fingerprint):
+    root, category = entry[0], entry[1]
+    feats = root_features(root, category, roots) if category in RULES else None
+    known = roots.get(root)
+    data = json.dumps([fingerprint, entry[:4], feats, known.pos if known else None], ensure_ascii=False)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_roots(path):
+    return {r.root: r for r in (load_roots() if path is None else load_roots(path))}
+
+
+def _init_worker(roots_path):
+    global _roots
+    _roots = _load_roots(roots_path)
+
+
+def _check_chunk(entries):
+    return [check_entry(*entry[:4], _roots) for entry in entries]
+
+
+def _chunks(items, size):
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate(entries, roots_path=None, cache_path=CACHE_PATH, workers=None):
+    """Check (root, category, form, explanation) entries; returns [(index, entry, issues)] for bad ones."""
+    roots = _load_roots(roots_path)
+    fingerprint = _engine_fingerprint()
+    cache = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+
+    hashes = [entry_hash(entry, roots, fingerprint) for entry in entries]
+    todo = [i for i, h in enumerate(hashes) if h not in cache]
+    unchecked = [entries[i] for i in todo]
+    workers = workers or os.cpu_count() or 1
+    if len(unchecked) < PARALLEL_MIN or workers == 1:
+        results = [check_entry(*entry[:4], roots) for entry in unchecked]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(roots_path,)) as pool:
+            results = [issues for chunk in pool.map(_check_chunk, _chunks(unchecked, CHUNK)) for issues in chunk]
+    for i, issues in zip(todo, results):
+        cache[hashes[i]] = issues
+
+    if cache_path:
+        # Keep only the entries seen this run, so the cache tracks the current data
+        seen = {h: cache[h] for h in hashes}
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(seen, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    return [(i, entries[i], cache[h]) for i, h in enumerate(hashes) if cache[h]]
+
+
+def lexicon_entries(roots_path=None):
+    return [
+        (root, category, form, explanation)
+        for category, items in build_suffix_examples(load_roots() if roots_path is None else load_roots(roots_path)).items()
+        for root, form, explanation, _ in items
+    ]
+
+
+def read_entries(path):
+    """Rows of root, category, form, explanation from a TSV (or, by extension, CSV) file."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter="," if path.endswith(".csv") else "\t")
+        rows = [tuple(row[:4]) for row in reader if len(row) >= 4 and not row[0].startswith("#")]
+    if rows and [c.strip().lower() for c in rows[0]] == ["root", "category", "form", "explanation"]:
+        rows = rows[1:]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", help="TSV/CSV of root, category, form, explanation (default: roots.tsv lexicon)")
+    parser.add_argument("--roots", help="roots.tsv giving parts of speech and flags")
+    parser.add_argument("--cache", default=CACHE_PATH, help="result cache file")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--workers", type=int, help="checking processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    entries = read_entries(args.path) if args.path else lexicon_entries(args.roots)
+    bad = validate(entries, args.roots, None if args.no_cache else args.cache, args.workers)
+    for index, (root, category, form, _), issues in bad:
+        for code, message in issues:
+            print(f"{index + 1}\t{root}\t{category}\t{form}\t{code}\t{message}")
+    print(f"{len(entries)} entries checked, {len(bad)} with issues", file=sys.stderr)
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""Browser quiz: `turkish-quiz-web` or `python -m turkish_quiz web`. Needs gradio.
+
+Several copies can serve the same learners when $QUIZ_STATE_URL names a
+shared session backend; give each its own GRADIO_SERVER_PORT and
+QUIZ_METRICS_PORT (see metrics) and put them behind a load balancer with
+sticky connections, which Gradio's event queue needs within a page load.
+"""
+
+import asyncio
+import gradio as gr
+import json
+import logging
+import os
+import tempfile
+from . import metrics
+from .analytics import error_table
+from .batch_grade import grade_csv
+from .chains import CHAIN_CATEGORY
+from .feature_index import SOFTENING_LABEL
+from .matcher import HINTS, grade
+from .mixed import MIXED_CATEGORY
+from .service import QuizService
+
+# Grade answers in the browser; results reach the server batched with the next question request
+CLIENT_SIDE_CHECK = True
+# Questions sent to the browser per batch, and how few may be left before it asks for more
+PREFETCH_SIZE = 10
+REFILL_AT = 3
+
+# Event queue settings. The handlers are async and return without blocking (off_loop
+# moves shared-backend I/O to worker threads), so they run directly on the event loop
+# and need no per-event concurrency cap (Gradio's default is one run at a time per
+# event). The backlog is left unbounded, as in Gradio; to reject requests at once
+# instead of queueing them, set MAX_QUEUE_SIZE from a loadtest.py run on the
+# deployment's own hardware.
+CONCURRENCY_LIMIT = None
+MAX_QUEUE_SIZE = None
+
+log = logging.getLogger(__name__)
+
+service = QuizService()
+
+# Question order: the Leitner deck, or Thompson sampling over how likely each answer is to be right
+ORDERS = {"Spaced repetition": False, "Adaptive": True}
+
+# Drill filters; ANY leaves a dimension unfiltered. Suffix choices follow the category.
+ANY = "Any"
+FINAL_CHOICES = [ANY, "vowel", "voiced", "voiceless", SOFTENING_LABEL]
+HARMONY_CHOICES = [ANY, "a/ı", "e/i", "o/u", "ö/ü"]
+
+# Time windows offered on the teacher dashboard, in seconds (None = since the app started)
+DASHBOARD_WINDOWS = {"All time": None, "Last 10 minutes": 600, "Last hour": 3600, "Last day": 86400}
+DASHBOARD_ROOTS = 25
+
+# Buffered questions are [suffix type, item, root, translation, answer, explanation];
+# current_question is [suffix type, item, answered] and progress events are
+# [suffix type, item, 1/0, or null when the question was skipped].
+
+# Mirrors check_answer and matcher.grade; appends the outcome to the pending progress batch
+CHECK_ANSWER_JS = """
+(userInput, correct, explanation, root, tolerant, current, pending) => {
+    const HINTS = %s;
+    const VOWELS = "aeıioöuü";
+    const ASCII = {"ç": "c", "ş": "s", "ğ": "g", "ı": "i", "ö": "o", "ü": "u"};
+    const SOFT_PAIRS = ["pb", "bp", "çc", "cç", "td", "dt", "kğ", "ğk", "kg", "gk"];
+    const fold = (s) => s.replace(/[çşğıöü]/g, (c) => ASCII[c]);
+    const normalize = (s) => {
+        s = (s || "").trim().replace(/I/g, "ı").replace(/İ/g, "i").toLowerCase();
+        return tolerant ? fold(s) : s;
+    };
+    const distance = (a, b) => {
+        let prev = Array.from({length: b.length + 1}, (_, j) => j);
+        for (let i = 1; i <= a.length; i++) {
+            const row = [i];
+            for (let j = 1; j <= b.length; j++) {
+                row.push(Math.min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1)));
+            }
+            prev = row;
+        }
+        return prev[b.length];
+    };
+    const diagnose = (a, c, r) => {
+        if (a.length === c.length) {
+            const diffs = [];
+            for (let i = 0; i < a.length; i++) if (a[i] !== c[i]) diffs.push(i);
+            if (diffs.every((i) => ASCII[c[i]] === a[i])) return "diacritics";
+            if (diffs.every((i) => VOWELS.includes(a[i]) && VOWELS.includes(c[i]) && i >= r.length - 1)) return "harmony";
+            if (diffs.length === 1) {
+                const i = diffs[0], pair = a[i] + c[i];
+                if (SOFT_PAIRS.includes(pair) && i === r.length - 1) return "softening";
+                if ((pair === "dt" || pair === "td") && i >= r.length) return "voicing";
+            }
+        } else if (Math.abs(a.length - c.length) === 1) {
+            const [longer, shorter] = a.length > c.length ? [a, c] : [c, a];
+            for (let i = 0; i < longer.length; i++) {
+                if ("yns".includes(longer[i]) && longer.slice(0, i) + longer.slice(i + 1) === shorter) return "buffer";
+            }
+        }
+        return distance(a, c) <= 2 ? "typo" : "wrong";
+    };
+
+    const answer = normalize(userInput), expected = normalize(correct);
+    const isCorrect = answer === expected;
+    const hint = isCorrect ? "" : HINTS[diagnose(answer, expected, normalize(root))];
+    const shown = JSON.parse(current || "null");
+    const events = JSON.parse(pending || "[]");
+    // Only the first submission counts; resubmitting shows the verdict again
+    if (shown && !shown[2]) {
+        events.push([shown[0], shown[1], isCorrect ? 1 : 0]);
+        shown[2] = 1;
+    }
+    const message = isCorrect ? "Correct! 🎉" : `Incorrect ❌. Correct answer: ${correct}` + (hint ? ` ${hint}` : "");
+    return [message, explanation, JSON.stringify(shown), JSON.stringify(events)];
+}
+""" % json.dumps(HINTS, ensure_ascii=False)
+
+# Shows the next buffered question without a server call and asks for more when running low
+TAKE_QUESTION_JS = """
+(buffer, current, pending) => {
+    const queue = JSON.parse(buffer || "[]");
+    const shown = JSON.parse(current || "null");
+    const events = JSON.parse(pending || "[]");
+    if (shown && !shown[2]) {
+        events.push([shown[0], shown[1], null]);
+    }
+    const next = queue.shift();
+    if (queue.length < %d) {
+        setTimeout(() => document.getElementById(next ? "refill-btn" : "reload-btn").click(), 0);
+    }
+    if (!next) {
+        return ["", "", "", "", "Loading more questions…", "null", "[]", JSON.stringify(events)];
+    }
+    return [next[2], next[3], next[4], next[5], "", JSON.stringify([next[0], next[1], 0]),
+            JSON.stringify(queue), JSON.stringify(events)];
+}
+""" % REFILL_AT
+
+# Appends a refill batch to the buffer and drops the progress events the server consumed;
+# mixed questions carry their own category, so any category is kept while Mixed is selected
+MERGE_QUESTIONS_JS = """
+(incoming, suffixType, buffer, pending) => {
+    const MIXED = %s;
+    const batch = JSON.parse(incoming || "{}");
+    const queue = JSON.parse(buffer || "[]");
+    const events = JSON.parse(pending || "[]").slice(batch.consumed || 0);
+    for (const question of batch.questions || []) {
+        if (question[0] === suffixType || suffixType === MIXED) {
+            queue.push(question);
+        } else {
+            events.push([question[0], question[1], null]);  // category changed meanwhile
+        }
+    }
+    return [JSON.stringify(queue), JSON.stringify(events)];
+}
+""" % json.dumps(MIXED_CATEGORY, ensure_ascii=False)
+
+def drill_filters(final, harmony, suffix):
+    return {dimension: value for dimension, value in (("final", final), ("harmony", harmony), ("suffix", suffix))
+            if value and value != ANY}
+
+async def off_loop(fn, *args):
+    # With a shared session backend every session lookup and save is a SQLite or socket round
+    # trip; run those in a worker thread so the event loop never waits on them
+    if service.blocking:
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+def replace_questions(session_id, suffix_type, order, drill, progress, unseen):
+    service.apply_progress(session_id, progress, strict=False)
+    service.skip_many(session_id, unseen)
+    return service.question_batch(session_id, suffix_type, PREFETCH_SIZE, ORDERS.get(order, False), drill)
+
+def refill(session_id, suffix_type, order, drill, progress):
+    consumed = service.apply_progress(session_id, progress, strict=False)
+    return consumed, service.question_batch(session_id, suffix_type, PREFETCH_SIZE, ORDERS.get(order, False), drill)
+
+@metrics.timed("get_new_question")
+async def get_new_question(suffix_type, order, final, harmony, suffix, current_question, question_buffer,
+                           pending_progress, request: gr.Request):
+    # Questions the learner will no longer see go back into their decks
+    current = json.loads(current_question or "null")
+    unseen = [question[:2] for question in json.loads(question_buffer or "[]") if isinstance(question, list)]
+    if isinstance(current, list) and len(current) == 3 and not current[2]:
+        unseen.append(current[:2])
+    batch = await off_loop(replace_questions, request.session_hash, suffix_type, order,
+                           drill_filters(final, harmony, suffix), json.loads(pending_progress or "[]"), unseen)
+    if batch:
+        first = batch.pop(0)
+        return (
+            first[2],  # root_word value
+            first[3],  # spanish_translation value
+            first[4],  # correct_answer value
+            first[5],  # explanation value
+            "",        # result value
+            json.dumps([first[0], first[1], 0]),  # current_question value
+            json.dumps(batch),  # question_buffer value
+            "[]"       # pending_progress value
+        )
+    return (
+        "",  # root_word
+        "",  # spanish_translation
+        "",  # correct_answer
+        "",  # explanation
+        "No questions match; choose another suffix type or drill",  # result
+        "null",  # current_question
+        "[]",  # question_buffer
+        "[]"  # pending_progress
+    )
+
+@metrics.timed("refill_questions")
+async def refill_questions(suffix_type, order, final, harmony, suffix, pending_progress, request: gr.Request):
+    consumed, batch = await off_loop(refill, request.session_hash, suffix_type, order,
+                                     drill_filters(final, harmony, suffix), json.loads(pending_progress or "[]"))
+    return json.dumps({"questions": batch, "consumed": consumed})
+
+# Reads the learner's saved progress from SQLite, so in a worker thread
+@metrics.timed("load_learner")
+async def load_learner(name, request: gr.Request):
+    if not name.strip():
+        return gr.update()
+    stats = await asyncio.to_thread(service.attach_learner, request.session_hash, name)
+    return gr.update(value=f"Welcome, {name.strip()}: {stats['correct_count']} correct "
+                           f"out of {stats['total_attempts']} so far")
+
+# Not async: indexing a category the first time walks all of its entries
+@metrics.timed("suffix_choices")
+def suffix_choices(suffix_type):
+    if suffix_type in (CHAIN_CATEGORY, MIXED_CATEGORY):
+        return gr.update(choices=[ANY], value=ANY)
+    return gr.update(choices=[ANY] + service.features.values(suffix_type, "suffix"), value=ANY)
+
+@metrics.timed("check_answer")
+async def check_answer(user_input, correct, explanation, root, tolerant, current_question, request: gr.Request):
+    outcome = grade(user_input, correct, root, tolerant)
+    current = json.loads(current_question or "null")
+    if isinstance(current, list) and len(current) == 3 and not current[2] and service.is_question(*current[:2]):
+        await off_loop(service.record_answer, request.session_hash, current[0], current[1], outcome.correct,
+                       root, explanation, user_input)
+        current[2] = 1
+    if outcome.correct:
+        return gr.update(value="Correct! 🎉"), gr.update(value=explanation), json.dumps(current)
+    else:
+        message = f"Incorrect ❌. Correct answer: {correct}"
+        if outcome.hint:
+            message += f" {outcome.hint}"
+        return gr.update(value=message), gr.update(value=explanation), json.dumps(current)
+
+# Not async, so Gradio runs it in a worker thread rather than on the event loop the quiz uses
+@metrics.timed("dashboard")
+def dashboard(window):
+    seconds = DASHBOARD_WINDOWS.get(window)
+    return (
+        error_table(service.error_stats.report("suffix_type", seconds)),
+        error_table(service.error_stats.report("rule", seconds)),
+        error_table(service.error_stats.report("root", seconds), limit=DASHBOARD_ROOTS),
+    )
+
+# Runs in a worker thread too; the grading itself happens in worker processes
+@metrics.timed("grade_worksheets")
+def grade_worksheets(path, tolerant):
+    if not path:
+        return None, None, "Upload a CSV with student, root, category and answer columns."
+    out_dir = tempfile.mkdtemp(prefix="graded-")
+    graded_path = os.path.join(out_dir, "graded.csv")
+    report_path = os.path.join(out_dir, "report.csv")
+    summary = grade_csv(path, graded_path, report_path, tolerant=tolerant)
+    message = (f"Graded {summary['rows']} answers from {summary['students']} students in "
+               f"{summary['seconds']}s: {summary['correct']} correct")
+    if summary["unknown"]:
+        message += f", {summary['unknown']} with a root or category not in the lexicon"
+    return graded_path, report_path, message + "."
+
+with gr.Blocks(title="Turkish Suffix Quiz", theme="soft", css=".hidden-control {display: none !important;}") as demo:
+    gr.Markdown("# 🇹🇷 Turkish Suffix Quiz")
+    gr.Markdown("Practice Turkish suffixation rules with Spanish translations")
+
+    with gr.Tab("Quiz"):
+        learner_name = gr.Textbox(label="Your Name", placeholder="Enter your name to keep your progress")
+        with gr.Row():
+            suffix_type = gr.Dropdown(
+                choices=["Plural", "Past Tense", "Future", "Present Continuous",
+                        "Conditional", "Locative", "Ablative", "Possessive", MIXED_CATEGORY, CHAIN_CATEGORY],
+                label="Select Suffix Type",
+                value="Plural"
+            )
+            order = gr.Radio(list(ORDERS), value="Spaced repetition", label="Question Order")
+            new_btn = gr.Button("New Question 🔄")
+
+        with gr.Accordion("Drill", open=False):
+            with gr.Row():
+                drill_final = gr.Dropdown(FINAL_CHOICES, value=ANY, label="Root Ends In")
+                drill_harmony = gr.Dropdown(HARMONY_CHOICES, value=ANY, label="Last Vowel")
+                drill_suffix = gr.Dropdown([ANY], value=ANY, label="Suffix Form")
+
+        with gr.Row():
+            root_word = gr.Textbox(label="Root Word", interactive=False)
+            spanish_translation = gr.Textbox(label="Spanish Translation", interactive=False)
+
+        user_answer = gr.Textbox(label="Your Answer (Turkish)", placeholder="Type the suffixed form here...")
+        tolerant = gr.Checkbox(label="No Turkish keyboard: accept c, s, g, i, o, u for ç, ş, ğ, ı, ö, ü", value=False)
+        submit_btn = gr.Button("Submit Answer ✅")
+
+        with gr.Row():
+            result = gr.Textbox(label="Result", interactive=False)
+            explanation = gr.Textbox(label="Explanation", interactive=False)
+
+        # Hidden textboxes rather than gr.State, so the browser can read them
+        correct_answer = gr.Textbox(visible=False)
+        current_question = gr.Textbox(value="null", visible=False)
+        question_buffer = gr.Textbox(value="[]", visible=False)
+        incoming_questions = gr.Textbox(visible=False)
+        pending_progress = gr.Textbox(value="[]", visible=False)
+        # Clicked from TAKE_QUESTION_JS; hidden with CSS so they stay in the page
+        refill_btn = gr.Button("Refill", elem_id="refill-btn", elem_classes="hidden-control")
+        reload_btn = gr.Button("Reload", elem_id="reload-btn", elem_classes="hidden-control")
+
+    with gr.Tab("Teacher Dashboard"):
+        with gr.Row():
+            dashboard_window = gr.Dropdown(list(DASHBOARD_WINDOWS), value="All time", label="Time Window")
+            refresh_btn = gr.Button("Refresh 📊")
+        headers = ["Answers", "Wrong", "Error Rate"]
+        category_table = gr.Dataframe(headers=["Suffix Type"] + headers, label="By Suffix Type")
+        rule_table = gr.Dataframe(headers=["Rule"] + headers, label="By Rule")
+        root_table = gr.Dataframe(headers=["Root"] + headers, label=f"By Root (top {DASHBOARD_ROOTS})")
+
+    with gr.Tab("Grade Worksheets"):
+        worksheet = gr.File(label="Answers CSV (student, root, category, answer)", file_types=[".csv"])
+        worksheet_tolerant = gr.Checkbox(label="Accept c, s, g, i, o, u for ç, ş, ğ, ı, ö, ü", value=False)
+        grade_btn = gr.Button("Grade 📝")
+        grade_summary = gr.Markdown()
+        with gr.Row():
+            graded_file = gr.File(label="Graded Answers")
+            report_file = gr.File(label="Per-Student Report")
+
+    demo.load(suffix_choices, inputs=[suffix_type], outputs=[drill_suffix], api_name=False)
+
+    learner_name.submit(load_learner, inputs=[learner_name], outputs=[result], api_name="load_learner")
+
+    for drill in (drill_final, drill_harmony, drill_suffix):
+        drill.input(
+            get_new_question,
+            inputs=[suffix_type, order, drill_final, drill_harmony, drill_suffix,
+                    current_question, question_buffer, pending_progress],
+            outputs=[root_word, spanish_translation, correct_answer, explanation, result,
+                     current_question, question_buffer, pending_progress],
+            api_name=False
+        )
+
+    # Reset the suffix drill first: the old category's suffixes would match nothing
+    suffix_type.change(
+        suffix_choices, inputs=[suffix_type], outputs=[drill_suffix], api_name=False
+    ).then(
+        get_new_question,
+        inputs=[suffix_type, order, drill_final, drill_harmony, drill_suffix,
+                current_question, question_buffer, pending_progress],
+        outputs=[root_word, spanish_translation, correct_answer, explanation, result,
+                 current_question, question_buffer, pending_progress],
+        api_name="change_category"
+    )
+
+    order.change(
+        get_new_question,
+        inputs=[suffix_type, order, drill_final, drill_harmony, drill_suffix,
+                current_question, question_buffer, pending_progress],
+        outputs=[root_word, spanish_translation, correct_answer, explanation, result,
+                 current_question, question_buffer, pending_progress],
+        api_name="change_order"
+    )
+
+    reload_btn.click(
+        get_new_question,
+        inputs=[suffix_type, order, drill_final, drill_harmony, drill_suffix,
+                current_question, question_buffer, pending_progress],
+        outputs=[root_word, spanish_translation, correct_answer, explanation, result,
+                 current_question, question_buffer, pending_progress],
+        api_name="reload"
+    )
+
+    demo.load(
+        get_new_question,
+        inputs=[suffix_type, order, drill_final, drill_harmony, drill_suffix,
+                current_question, question_buffer, pending_progress],
+        outputs=[root_word, spanish_translation, correct_answer, explanation, result,
+                 current_question, question_buffer, pending_progress],
+        api_name="load"
+    )
+
+    new_btn.click(
+        None,
+        inputs=[question_buffer, current_question, pending_progress],
+        outputs=[root_word, spanish_translation, correct_answer, explanation, result,
+                 current_question, question_buffer, pending_progress],
+        js=TAKE_QUESTION_JS
+    )
+
+    refill_btn.click(
+        refill_questions,
+        inputs=[suffix_type, order, drill_final, drill_harmony, drill_suffix, pending_progress],
+        outputs=[incoming_questions],
+        api_name="refill"
+    ).then(
+        None,
+        inputs=[incoming_questions, suffix_type, question_buffer, pending_progress],
+        outputs=[question_buffer, pending_progress],
+        js=MERGE_QUESTIONS_JS
+    )
+
+    if CLIENT_SIDE_CHECK:
+        submit_btn.click(
+            None,
+            inputs=[user_answer, correct_answer, explanation, root_word, tolerant, current_question, pending_progress],
+            outputs=[result, explanation, current_question, pending_progress],
+            js=CHECK_ANSWER_JS
+        )
+
+        user_answer.submit(
+            None,
+            inputs=[user_answer, correct_answer, explanation, root_word, tolerant, current_question, pending_progress],
+            outputs=[result, explanation, current_question, pending_progress],
+            js=CHECK_ANSWER_JS
+        )
+    else:
+        submit_btn.click(
+            check_answer,
+            inputs=[user_answer, correct_answer, explanation, root_word, tolerant, current_question],
+            outputs=[result, explanation, current_question],
+            api_name="check_answer"
+        )
+
+        user_answer.submit(
+            check_answer,
+            inputs=[user_answer, correct_answer, explanation, root_word, tolerant, current_question],
+            outputs=[result, explanation, current_question],
+            api_name=False
+        )
+
+    for trigger in (refresh_btn.click, dashboard_window.change):
+        trigger(
+            dashboard,
+            inputs=[dashboard_window],
+            outputs=[category_table, rule_table, root_table],
+            concurrency_limit=1,
+            api_name=False
+        )
+
+    grade_btn.click(
+        grade_worksheets,
+        inputs=[worksheet, worksheet_tolerant],
+        outputs=[graded_file, report_file, grade_summary],
+        concurrency_limit=1,
+        api_name=False
+    )
+
+demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT, max_size=MAX_QUEUE_SIZE)
+
+def main():
+    # Prometheus metrics and the sampling profiler on a local port; QUIZ_METRICS_PORT=0 turns them off
+    port = int(os.environ.get("QUIZ_METRICS_PORT", metrics.METRICS_PORT))
+    if port:
+        try:
+            metrics.serve(port=port)
+        except OSError as e:
+            # Most likely another worker on this host has the port; the quiz works without metrics
+            log.warning("not serving metrics on port %d: %s", port, e)
+    # GRADIO_SHARE=false keeps the app on localhost, e.g. under loadtest.py
+    demo.launch(share=os.environ.get("GRADIO_SHARE", "true").lower() == "true")
+
+if __name__ == "__main__":
+    main()
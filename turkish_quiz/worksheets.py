@@ -0,0 +1,159 @@
+"""Printable worksheets with matching answer keys.
+
+Every variant draws its own questions from a random generator seeded with
+the run's seed and the variant number, so any variant can be reproduced on
+its own. Variants are rendered, and written as HTML (and PDF when weasyprint
+is installed), in a pool of worker processes that each map the compiled
+lexicon once.
+
+    python -m turkish_quiz.worksheets --variants 500 --questions 20 --seed 2026 --out worksheets
+    python -m turkish_quiz.worksheets --category Plural --category Locative --pdf
+"""
+
+import argparse
+import html
+import importlib.util
+import os
+import random
+import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+from .compiled_lexicon import open_lexicon
+
+QUESTIONS = 20
+STYLE = """
+body { font-family: sans-serif; margin: 2em; }
+h1 { font-size: 1.4em; margin-bottom: 0.2em; }
+.meta { color: #555; margin-bottom: 1.5em; }
+ol li { margin: 0.9em 0; }
+.blank { display: inline-block; min-width: 12em; border-bottom: 1px solid #000; }
+.rule { color: #555; font-size: 0.9em; }
+@media print { body { margin: 1cm; } }
+"""
+
+_lexicon = None  # one memory map per worker process
+
+
+def pick_questions(lexicon, categories, n, rng):
+    """`n` (category, root, form, explanation, translation) tuples, mixed across `categories`."""
+    ends = list(accumulate(len(lexicon[category]) for category in categories))
+    total = ends[-1] if ends else 0
+    # Sampling a range picks indexes without listing every entry; each is then found in its category
+    questions = []
+    for index in rng.sample(range(total), min(n, total)):
+        c = bisect_right(ends, index)
+        category = categories[c]
+        questions.append((category,) + tuple(lexicon[category][index - (ends[c - 1] if c else 0)]))
+    return questions
+
+
+def _page(title, meta, items):
+    return (
+        "<!DOCTYPE html>\n<html lang=\"tr\"><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title><style>{STYLE}</style></head><body>"
+        f"<h1>{html.escape(title)}</h1><div class=\"meta\">{meta}</div>"
+        f"<ol>{''.join(items)}</ol></body></html>\n"
+    )
+
+
+def render(title, variant, questions):
+    """Return (worksheet HTML, answer key HTML) for one variant."""
+    name = f"{html.escape(title)} · Variant {variant}"
+    worksheet = _page(
+        f"{title} · Variant {variant}",
+        "Name: <span class=\"blank\"></span> &nbsp; Date: <span class=\"blank\"></span>",
+        [
+            f"<li><b>{html.escape(root)}</b> ({html.escape(category)}, <i>{html.escape(translation)}</i>) → "
+            "<span class=\"blank\"></span></li>"
+            for category, root, _, _, translation in questions
+        ],
+    )
+    key = _page(
+        f"{title} · Variant {variant} · Answer Key",
+        f"Answer key for {name}",
+        [
+            f"<li><b>{html.escape(root)}</b> → {html.escape(form)}"
+            f"<div class=\"rule\">{html.escape(explanation)}</div></li>"
+            for _, root, form, explanation, _ in questions
+        ],
+    )
+    return worksheet, key
+
+
+def write_pdf(markup, path):
+    from weasyprint import HTML
+
+    HTML(string=markup).write_pdf(path)
+
+
+def _init_worker():
+    global _lexicon
+    _lexicon = open_lexicon()
+
+
+def make_variant(variant, seed, categories, n, title, out_dir, pdf):
+    """Render and write one variant; returns the paths written."""
+    rng = random.Random(f"{seed}:{variant}")
+    questions = pick_questions(_lexicon, categories, n, rng)
+    paths = []
+    for kind, markup in zip(("worksheet", "key"), render(title, variant, questions)):
+        path = os.path.join(out_dir, f"{kind}-{variant:03d}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markup)
+        paths.append(path)
+        if pdf:
+            paths.append(path[:-len(".html")] + ".pdf")
+            write_pdf(markup, paths[-1])
+    return paths
+
+
+def _make_variant(args):
+    return make_variant(*args)
+
+
+def generate(variants, seed, categories=None, n=QUESTIONS, title="Turkish Suffix Quiz", out_dir="worksheets",
+             pdf=False, workers=None):
+    """Write `variants` worksheets and answer keys to `out_dir`; returns the paths written."""
+    if categories is None:
+        categories = list(open_lexicon())
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(variant, seed, categories, n, title, out_dir, pdf) for variant in range(1, variants + 1)]
+    workers = min(workers or os.cpu_count() or 1, variants)
+    if workers <= 1:
+        _init_worker()
+        return [path for job in jobs for path in _make_variant(job)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return [path for paths in pool.map(_make_variant, jobs, chunksize=chunksize) for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, default=30)
+    parser.add_argument("--questions", type=int, default=QUESTIONS, help="questions per worksheet")
+    parser.add_argument("--category", action="append", dest="categories",
+                        help="suffix category to draw from; repeat for several (default: all, mixed)")
+    parser.add_argument("--seed", default="0", help="same seed, same worksheets")
+    parser.add_argument("--title", default="Turkish Suffix Quiz")
+    parser.add_argument("--out", default="worksheets", help="output directory")
+    parser.add_argument("--pdf", action="store_true", help="also write PDFs (needs weasyprint)")
+    parser.add_argument("--workers", type=int, help="rendering processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    if args.categories:
+        known = list(open_lexicon())
+        unknown = [c for c in args.categories if c not in known]
+        if unknown:
+            parser.error(f"unknown categories {unknown}; choose from {known}")
+    if args.pdf and importlib.util.find_spec("weasyprint") is None:
+        parser.error("--pdf needs weasyprint (pip install weasyprint)")
+
+    paths = generate(args.variants, args.seed, args.categories, args.questions, args.title, args.out,
+                     args.pdf, args.workers)
+    print(f"wrote {len(paths)} files to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()